@@ -12,7 +12,6 @@ class ActiveStatusSchema:
 class ATCCodeBase(BaseModel):
     name: str
     code: str = Field(..., description="e.g., 'A02BC02'")
-    level: int = Field(..., ge=1, le=5, description="1 (Anatomical) to 5 (Chemical)")
     slug: str
     status: str = ActiveStatusSchema.ACTIVE
     description: Optional[str] = None
@@ -26,6 +25,7 @@ class ATCCodeCreate(ATCCodeBase):
 class ATCCodeResponse(ATCCodeBase):
     id: int
     parent_id: Optional[int] = None
+    level: int = Field(..., ge=1, le=5, description="1 (Anatomical) to 5 (Chemical), maintained by MPTT")
     created_by: Optional[str] = None
     updated_by: Optional[str] = None
     deleted_by: Optional[str] = None
@@ -148,6 +148,16 @@ class MedicineResponse(MedicineBase):
     class Config:
         from_attributes = True
 
+class MedicineSummaryResponse(BaseModel):
+    # Lightweight list item: no description or nested relationships
+    id: int
+    name: str
+    slug: str
+    status: str
+
+    class Config:
+        from_attributes = True
+
 # Schemas for associating relationships
 class MedicineCategoryAssociation(BaseModel):
     medicine_id: int
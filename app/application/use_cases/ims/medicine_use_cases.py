@@ -15,6 +15,7 @@ from app.application.schemas.ims.medicine_schemas import (
     MedicineCreate,
     MedicineUpdate,
     MedicineResponse,
+    MedicineSummaryResponse,
     CategoryCreate,
     CategoryUpdate, # Added for update
     CategoryResponse,
@@ -79,13 +80,20 @@ class MedicineUseCases:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Medicine not found")
         return MedicineResponse.model_validate(medicine_entity)
 
-    async def list_medicines(self, skip: int = 0, limit: int = 100) -> List[MedicineResponse]:
+    async def list_medicines(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineResponse]:
         """
         Lists all medicines with pagination.
         """
-        medicine_entities = await self._medicine_service.list_all_medicines(skip, limit)
+        medicine_entities = await self._medicine_service.list_all_medicines(skip, limit, after_id)
         return [MedicineResponse.model_validate(entity) for entity in medicine_entities]
 
+    async def list_medicines_summary(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineSummaryResponse]:
+        """
+        Lists medicines with pagination, returning only id, name, slug and status.
+        """
+        medicine_entities = await self._medicine_service.list_medicines_summary(skip, limit, after_id)
+        return [MedicineSummaryResponse.model_validate(entity) for entity in medicine_entities]
+
     async def update_medicine(self, medicine_id: int, medicine_update: MedicineUpdate) -> MedicineResponse:
         """
         Updates an existing medicine and handles relationship updates.
@@ -104,17 +112,16 @@ class MedicineUseCases:
         try:
             updated_medicine_entity = await self._medicine_service.update_medicine_details(medicine_id, existing_medicine_entity)
 
-            # Handle category relationship updates
-            if medicine_update.add_category_ids:
-                await self._medicine_service.add_categories_to_medicine(medicine_id, medicine_update.add_category_ids)
-            if medicine_update.remove_category_ids:
-                await self._medicine_service.remove_categories_from_medicine(medicine_id, medicine_update.remove_category_ids)
-
-            # Handle ATC code relationship updates
-            if medicine_update.add_atc_code_ids:
-                await self._medicine_service.add_atc_codes_to_medicine(medicine_id, medicine_update.add_atc_code_ids)
-            if medicine_update.remove_atc_code_ids:
-                await self._medicine_service.remove_atc_codes_from_medicine(medicine_id, medicine_update.remove_atc_code_ids)
+            # Handle category and ATC code relationship updates in a single transaction
+            if (medicine_update.add_category_ids or medicine_update.remove_category_ids
+                    or medicine_update.add_atc_code_ids or medicine_update.remove_atc_code_ids):
+                await self._medicine_service.update_medicine_associations(
+                    medicine_id,
+                    add_category_ids=medicine_update.add_category_ids,
+                    remove_category_ids=medicine_update.remove_category_ids,
+                    add_atc_code_ids=medicine_update.add_atc_code_ids,
+                    remove_atc_code_ids=medicine_update.remove_atc_code_ids
+                )
 
             # Re-fetch the complete entity to ensure all relationships are updated in response
             full_updated_medicine_entity = await self._medicine_service.get_medicine_details(medicine_id)
@@ -181,8 +188,8 @@ class MedicineUseCases:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Category not found or could not be deleted.")
         return True
 
-    async def list_categories(self, skip: int = 0, limit: int = 100) -> List[CategoryResponse]:
-        category_entities = await self._medicine_service.list_all_categories(skip, limit)
+    async def list_categories(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CategoryResponse]:
+        category_entities = await self._medicine_service.list_all_categories(skip, limit, after_id)
         return [CategoryResponse.model_validate(entity) for entity in category_entities]
 
     async def get_category_tree(self) -> List[CategoryResponse]:
@@ -219,6 +226,12 @@ class MedicineUseCases:
         """
         return await self._medicine_service.get_children_of_category_with_child_count(category_id)
 
+    async def get_children_of_categories_with_child_count(self, category_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Retrieves the direct children of several categories in one call, keyed by category ID.
+        """
+        return await self._medicine_service.get_children_of_categories_with_child_count(category_ids)
+
     # --- DoseForm Use Cases ---
     async def create_dose_form(self, dose_form_create: DoseFormCreate) -> DoseFormResponse:
         dose_form_entity = DoseFormEntity(
@@ -264,7 +277,6 @@ class MedicineUseCases:
             parent_id=atc_code_create.parent_id,
             name=atc_code_create.name,
             code=atc_code_create.code,
-            level=atc_code_create.level,
             slug=atc_code_create.slug,
             status=atc_code_create.status,
             description=atc_code_create.description,
@@ -278,6 +290,6 @@ class MedicineUseCases:
         except ValueError as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    async def list_atc_codes(self, skip: int = 0, limit: int = 100) -> List[ATCCodeResponse]:
-        atc_code_entities = await self._medicine_service.list_all_atc_codes(skip, limit)
+    async def list_atc_codes(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[ATCCodeResponse]:
+        atc_code_entities = await self._medicine_service.list_all_atc_codes(skip, limit, after_id)
         return [ATCCodeResponse.model_validate(entity) for entity in atc_code_entities]
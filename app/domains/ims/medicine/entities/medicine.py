@@ -11,7 +11,9 @@ class ActiveStatus:
     PENDING = "pending"
     ARCHIVED = "archived"
 
-@dataclass
+# Entities are built once per row on list endpoints; slots=True skips the per-instance
+# __dict__, which makes construction and attribute access cheaper and instances smaller.
+@dataclass(slots=True)
 class ATCCodeEntity:
     """
     Domain entity for ATC Codes.
@@ -20,16 +22,16 @@ class ATCCodeEntity:
     
     name: str
     code: str
-    level: int
     slug: str
     status: str = ActiveStatus.ACTIVE
     id: Optional[int] = None
     parent_id: Optional[int] = None
+    level: Optional[int] = None # Assigned by MPTT on insert
     description: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryEntity:
     """
     Domain entity for Categories.
@@ -48,7 +50,7 @@ class CategoryEntity:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class DoseFormEntity:
     """
     Domain entity for Dose Forms.
@@ -59,7 +61,7 @@ class DoseFormEntity:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-@dataclass
+@dataclass(slots=True)
 class StrengthEntity:
     """
     Domain entity for Strengths.
@@ -82,7 +84,7 @@ class StrengthEntity:
     updated_at: Optional[datetime] = None
     
 
-@dataclass
+@dataclass(slots=True)
 class MedicineEntity:
     """
     Domain entity for Medicine.
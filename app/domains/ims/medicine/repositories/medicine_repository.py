@@ -1,7 +1,7 @@
 # app/domains/ims/medicine/repositories/medicine_repository.py
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 
 from app.domains.ims.medicine.entities.medicine import (
     MedicineEntity,
@@ -28,8 +28,13 @@ class IMedicineRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_all_medicines(self, skip: int = 0, limit: int = 100) -> List[MedicineEntity]:
-        """Retrieves all medicines with pagination."""
+    async def get_all_medicines(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineEntity]:
+        """Retrieves all medicines with pagination. `after_id` switches to keyset pagination (id > after_id)."""
+        pass
+
+    @abstractmethod
+    async def get_all_medicines_summary(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineEntity]:
+        """Retrieves medicines with pagination, populating only id, name, slug and status."""
         pass
 
     @abstractmethod
@@ -37,6 +42,11 @@ class IMedicineRepository(ABC):
         """Creates a new medicine record."""
         pass
 
+    @abstractmethod
+    async def bulk_create_medicines(self, medicines: Iterable[MedicineEntity], chunk_size: int = 500) -> int:
+        """Creates many medicine records in one transaction, one INSERT per chunk. Returns the number created."""
+        pass
+
     @abstractmethod
     async def update_medicine(self, medicine_id: int, medicine: MedicineEntity) -> Optional[MedicineEntity]:
         """Updates an existing medicine record."""
@@ -49,7 +59,7 @@ class IMedicineRepository(ABC):
 
     @abstractmethod
     async def add_categories_to_medicine(self, medicine_id: int, category_ids: List[int]) -> None:
-        """Adds categories to a medicine."""
+        """Adds categories to a medicine. Raises ValueError if any category does not exist."""
         pass
 
     @abstractmethod
@@ -57,6 +67,21 @@ class IMedicineRepository(ABC):
         """Removes categories from a medicine."""
         pass
 
+    @abstractmethod
+    async def update_medicine_associations(
+        self,
+        medicine_id: int,
+        add_category_ids: Optional[List[int]] = None,
+        remove_category_ids: Optional[List[int]] = None,
+        add_atc_code_ids: Optional[List[int]] = None,
+        remove_atc_code_ids: Optional[List[int]] = None
+    ) -> None:
+        """
+        Applies category and ATC code link changes to a medicine in a single transaction.
+        Raises ValueError (and applies nothing) if the medicine or any ID to add does not exist.
+        """
+        pass
+
     @abstractmethod
     async def get_category_by_id(self, category_id: int, include_children: bool = True) -> Optional[CategoryEntity]:
         """Retrieves a category by its ID."""
@@ -78,7 +103,7 @@ class IMedicineRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_all_categories(self, skip: int = 0, limit: int = 100) -> List[CategoryEntity]:
+    async def get_all_categories(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CategoryEntity]:
         """Retrieves all categories with pagination (flat list)."""
         pass
 
@@ -103,6 +128,14 @@ class IMedicineRepository(ABC):
         """
         pass   
 
+    @abstractmethod
+    async def get_children_of_categories_with_child_count(self, category_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Same as get_children_of_category_with_child_count() for several categories at once,
+        keyed by category ID. Categories without children map to an empty list.
+        """
+        pass
+
     @abstractmethod
     async def create_category(self, category: CategoryEntity, parent_id: Optional[int] = None) -> CategoryEntity:
         """Creates a new category record, optionally as a child of another."""
@@ -148,6 +181,11 @@ class IMedicineRepository(ABC):
         """Creates a new strength record."""
         pass
 
+    @abstractmethod
+    async def bulk_create_strengths(self, strengths: Iterable[StrengthEntity], chunk_size: int = 500) -> int:
+        """Creates many strength records in one transaction, one INSERT per chunk. Returns the number created."""
+        pass
+
     @abstractmethod
     async def get_atc_code_by_id(self, atc_code_id: int) -> Optional[ATCCodeEntity]:
         """Retrieves an ATC code by its ID."""
@@ -164,7 +202,7 @@ class IMedicineRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_all_atc_codes(self, skip: int = 0, limit: int = 100) -> List[ATCCodeEntity]:
+    async def get_all_atc_codes(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[ATCCodeEntity]:
         """Retrieves all ATC codes with pagination."""
         pass
 
@@ -175,7 +213,7 @@ class IMedicineRepository(ABC):
 
     @abstractmethod
     async def add_atc_codes_to_medicine(self, medicine_id: int, atc_code_ids: List[int]) -> None:
-        """Adds ATC codes to a medicine."""
+        """Adds ATC codes to a medicine. Raises ValueError if any ATC code does not exist."""
         pass
 
     @abstractmethod
@@ -41,11 +41,7 @@ class MedicineService:
         # Business logic: Generate slug if not provided or ensure it's valid
         if not medicine_data.slug:
             medicine_data.slug = slugify(medicine_data.name)
-        # Ensure slug uniqueness (this check would ideally be in the repository or a dedicated domain validation)
-        existing_medicine = await self._repository.get_medicine_by_slug(medicine_data.slug)
-        if existing_medicine:
-            raise ValueError(f"Medicine with slug '{medicine_data.slug}' already exists.")
-
+        # Slug uniqueness is enforced by the unique constraint; the repository raises ValueError on conflict
         return await self._repository.create_medicine(medicine_data)
 
     async def update_medicine_details(self, medicine_id: int, medicine_data: MedicineEntity) -> Optional[MedicineEntity]:
@@ -69,13 +65,7 @@ class MedicineService:
         elif medicine_data.slug: # If a new slug is provided, use it
             existing_medicine.slug = medicine_data.slug
 
-        # Ensure updated slug uniqueness
-        if existing_medicine.slug:
-            check_existing = await self._repository.get_medicine_by_slug(existing_medicine.slug)
-            if check_existing and check_existing.id != medicine_id:
-                raise ValueError(f"Medicine with slug '{existing_medicine.slug}' already exists.")
-
-
+        # Updated slug uniqueness is enforced by the unique constraint (ValueError from the repository)
         return await self._repository.update_medicine(medicine_id, existing_medicine)
 
     async def delete_medicine_record(self, medicine_id: int) -> bool:
@@ -84,20 +74,24 @@ class MedicineService:
         """
         return await self._repository.delete_medicine(medicine_id)
 
-    async def list_all_medicines(self, skip: int = 0, limit: int = 100) -> List[MedicineEntity]:
+    async def list_all_medicines(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineEntity]:
         """
         Lists all medicines with pagination.
         """
-        return await self._repository.get_all_medicines(skip, limit)
+        return await self._repository.get_all_medicines(skip, limit, after_id)
+
+    async def list_medicines_summary(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineEntity]:
+        """
+        Lists medicines with pagination, with only the fields needed for list views.
+        """
+        return await self._repository.get_all_medicines_summary(skip, limit, after_id)
 
     async def add_categories_to_medicine(self, medicine_id: int, category_ids: List[int]) -> None:
         """
         Adds categories to a medicine, ensuring categories exist.
         """
-        # Business logic: Verify category_ids exist before adding
-        for cat_id in category_ids:
-            if not await self._repository.get_category_by_id(cat_id):
-                raise ValueError(f"Category with ID {cat_id} not found.")
+        # Business logic: category_ids must exist. The repository verifies this with one query
+        # in the same transaction as the insert instead of one lookup per ID here.
         await self._repository.add_categories_to_medicine(medicine_id, category_ids)
 
     async def remove_categories_from_medicine(self, medicine_id: int, category_ids: List[int]) -> None:
@@ -106,6 +100,21 @@ class MedicineService:
         """
         await self._repository.remove_categories_from_medicine(medicine_id, category_ids)
 
+    async def update_medicine_associations(
+        self,
+        medicine_id: int,
+        add_category_ids: Optional[List[int]] = None,
+        remove_category_ids: Optional[List[int]] = None,
+        add_atc_code_ids: Optional[List[int]] = None,
+        remove_atc_code_ids: Optional[List[int]] = None
+    ) -> None:
+        """
+        Adds and removes a medicine's categories and ATC codes in one transaction.
+        """
+        await self._repository.update_medicine_associations(
+            medicine_id, add_category_ids, remove_category_ids, add_atc_code_ids, remove_atc_code_ids
+        )
+
     # Category related methods
     async def create_new_category(self, category_data: CategoryEntity, parent_id: Optional[int] = None) -> CategoryEntity:
         """
@@ -113,12 +122,8 @@ class MedicineService:
         """
         if not category_data.slug:
             category_data.slug = slugify(category_data.name)
-        
-        # Ensure slug uniqueness for categories
-        existing_category = await self._repository.get_category_by_slug(category_data.slug)
-        if existing_category:
-            raise ValueError(f"Category with slug '{category_data.slug}' already exists.")
 
+        # Slug uniqueness is enforced by the unique constraint; the repository raises ValueError on conflict
         return await self._repository.create_category(category_data, parent_id)
 
     async def get_category_by_id(self, category_id: int) -> Optional[CategoryEntity]:
@@ -140,6 +145,12 @@ class MedicineService:
         Retrieves direct children of a specific category, including a count of their own direct children.
         """
         return await self._repository.get_children_of_category_with_child_count(category_id)  
+
+    async def get_children_of_categories_with_child_count(self, category_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Retrieves the direct children of several categories at once, keyed by category ID.
+        """
+        return await self._repository.get_children_of_categories_with_child_count(category_ids)
     
     async def get_category_subtree(self, category_id: int) -> Optional[CategoryEntity]:
         """
@@ -170,12 +181,7 @@ class MedicineService:
         else: # If name changed and slug not provided, regenerate
             existing_category.slug = slugify(category_data.name)
 
-        # Ensure updated slug uniqueness (excluding itself)
-        if existing_category.slug:
-            check_existing = await self._repository.get_category_by_slug(existing_category.slug)
-            if check_existing and check_existing.id != category_id:
-                raise ValueError(f"Category with slug '{existing_category.slug}' already exists.")
-
+        # Updated slug uniqueness is enforced by the unique constraint (ValueError from the repository)
         return await self._repository.update_category(category_id, existing_category)
 
     async def delete_category_record(self, category_id: int) -> bool:
@@ -185,11 +191,11 @@ class MedicineService:
         return await self._repository.delete_category(category_id)
 
 
-    async def list_all_categories(self, skip: int = 0, limit: int = 100) -> List[CategoryEntity]:
+    async def list_all_categories(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CategoryEntity]:
         """
         Lists all categories with pagination (flat list).
         """
-        return await self._repository.get_all_categories(skip, limit)
+        return await self._repository.get_all_categories(skip, limit, after_id)
 
     async def get_category_tree(self) -> List[CategoryEntity]:
         """
@@ -232,28 +238,24 @@ class MedicineService:
     async def create_new_atc_code(self, atc_code_data: ATCCodeEntity) -> ATCCodeEntity:
         """
         Creates a new ATC code.
-        Business logic: Ensure code and slug are unique.
+        Business logic: Ensure code and slug are unique (enforced by the unique constraints).
         """
-        if await self._repository.get_atc_code_by_code(atc_code_data.code):
-            raise ValueError(f"ATC Code '{atc_code_data.code}' already exists.")
         if not atc_code_data.slug: # Generate slug for ATC code if not provided
             atc_code_data.slug = slugify(atc_code_data.name)
         # Additional slug uniqueness check if slug is also unique and not derived directly from code
         return await self._repository.create_atc_code(atc_code_data)
 
-    async def list_all_atc_codes(self, skip: int = 0, limit: int = 100) -> List[ATCCodeEntity]:
+    async def list_all_atc_codes(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[ATCCodeEntity]:
         """
         Lists all ATC codes.
         """
-        return await self._repository.get_all_atc_codes(skip, limit)
+        return await self._repository.get_all_atc_codes(skip, limit, after_id)
 
     async def add_atc_codes_to_medicine(self, medicine_id: int, atc_code_ids: List[int]) -> None:
         """
         Adds ATC codes to a medicine, ensuring ATC codes exist.
         """
-        for atc_id in atc_code_ids:
-            if not await self._repository.get_atc_code_by_id(atc_id):
-                raise ValueError(f"ATC Code with ID {atc_id} not found.")
+        # The repository verifies the IDs with one IN query instead of one lookup per ID here
         await self._repository.add_atc_codes_to_medicine(medicine_id, atc_code_ids)
 
     async def remove_atc_codes_from_medicine(self, medicine_id: int, atc_code_ids: List[int]) -> None:
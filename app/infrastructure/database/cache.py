@@ -0,0 +1,56 @@
+# app/infrastructure/database/cache.py
+
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Process-wide TTL cache for read-mostly reference data. Entries outlive the request:
+# they hold finished domain entities (never ORM objects, which are bound to a session).
+# Keys are tuples whose first element is a namespace, so writers can drop every page
+# of a listing at once.
+# Cached values are shared between requests and must be treated as read-only.
+# With several worker processes, each keeps its own copy; another worker's write
+# becomes visible here after at most `_SHARED_TTL` seconds.
+_SHARED_TTL = 60.0
+_SHARED_MAXSIZE = 64
+_shared: Dict[Tuple[Hashable, ...], Tuple[float, Any]] = {}
+# Bumped by every invalidate_shared(namespace). A reader captures it before querying and
+# hands it to set_shared(), so a snapshot read before a concurrent write is not cached.
+_generations: Dict[Hashable, int] = {}
+
+
+def shared_generation(namespace: str) -> int:
+    """Returns the current invalidation generation of `namespace`. Capture it before the query."""
+    return _generations.get(namespace, 0)
+
+
+def get_shared(key: Tuple[Hashable, ...]) -> Optional[Any]:
+    """Returns the cached value for `key`, or None when missing or expired."""
+    entry = _shared.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _shared.pop(key, None)
+        return None
+    return value
+
+
+def set_shared(key: Tuple[Hashable, ...], value: Any, generation: int, ttl: float = _SHARED_TTL) -> Any:
+    """
+    Caches `value` under `key` for `ttl` seconds, evicting the oldest entry when full. Returns `value`.
+    `generation` is shared_generation(key[0]) as captured before `value` was read; if the
+    namespace has been invalidated since, `value` may predate that write and is not cached.
+    """
+    if generation != shared_generation(key[0]):
+        return value
+    if key not in _shared and len(_shared) >= _SHARED_MAXSIZE:
+        _shared.pop(next(iter(_shared)))
+    _shared[key] = (time.monotonic() + ttl, value)
+    return value
+
+
+def invalidate_shared(namespace: str) -> None:
+    """Drops every entry whose key starts with `namespace`. Call after committing a write."""
+    _generations[namespace] = shared_generation(namespace) + 1
+    for key in [key for key in _shared if key[0] == namespace]:
+        _shared.pop(key, None)
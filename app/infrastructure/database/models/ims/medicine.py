@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     DECIMAL,
     UniqueConstraint,    
+    Index,
 )
 from sqlalchemy.orm import (
     Mapped,
@@ -36,7 +37,7 @@ class ATCCode(Base, TimestampMixin, BaseNestedSets): # Added TimestampMixin, Sof
     parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey('atc_codes.id'), nullable=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     code: Mapped[str] = mapped_column(String, unique=True, nullable=False)
-    level: Mapped[int] = mapped_column(Integer, nullable=False) # MPTT also uses 'level'
+    # 'level' is provided and maintained by MPTT (root = 1, child = parent + 1)
     slug: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     status: Mapped[str] = mapped_column(String, default="active", nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)   
@@ -71,7 +72,7 @@ class Category(Base, TimestampMixin, BaseNestedSets): # Added TimestampMixin, Ba
     # We keep parent_id explicitly here as it's part of your original schema.
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey('categories.id'), nullable=True)
+    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey('categories.id'), nullable=True, index=True) # children counts / direct-children lookups
 
     name: Mapped[str] = mapped_column(String, nullable=False)
     slug: Mapped[Optional[str]] = mapped_column(String, unique=True, nullable=True)
@@ -96,6 +97,10 @@ class Category(Base, TimestampMixin, BaseNestedSets): # Added TimestampMixin, Ba
         overlaps="medicines,categories"
     )
 
+    # Subtree and full-tree reads filter on tree_id and a lft/rgt range (and order by
+    # tree_id, lft); MPTT only indexes lft and rgt separately.
+    __table_args__ = (Index("ix_categories_tree_lft_rgt", "tree_id", "lft", "rgt"),)
+
 
 class DoseForm(Base, TimestampMixin): # Added TimestampMixin
     __tablename__ = "dose_forms"
@@ -174,7 +179,7 @@ class MedicineCategory(Base, TimestampMixin): # Added TimestampMixin
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     medicine_id: Mapped[int] = mapped_column(ForeignKey('medicines.id', ondelete='CASCADE'), nullable=False)
-    category_id: Mapped[int] = mapped_column(ForeignKey('categories.id', ondelete='CASCADE'), nullable=False)
+    category_id: Mapped[int] = mapped_column(ForeignKey('categories.id', ondelete='CASCADE'), nullable=False, index=True) # reverse lookups; the unique constraint leads with medicine_id
 
     # Define relationships from pivot table back to main tables
     medicine: Mapped["Medicine"] = relationship("Medicine", back_populates="medicine_categories_association")
@@ -207,9 +212,9 @@ class Strength(Base, TimestampMixin): # Added TimestampMixin
     medicine_id: Mapped[int] = mapped_column(ForeignKey('medicines.id', ondelete='CASCADE'), nullable=False)
     dose_form_id: Mapped[int] = mapped_column(ForeignKey('dose_forms.id'), nullable=False)
 
-    concentration_amount: Mapped[float] = mapped_column(DECIMAL(8, 3), nullable=False) # Changed to float for Mapped
+    concentration_amount: Mapped[float] = mapped_column(DECIMAL(8, 3, asdecimal=False), nullable=False) # Returned as float, no Decimal per row
     concentration_unit: Mapped[str] = mapped_column(String, nullable=False)
-    volume_amount: Mapped[Optional[float]] = mapped_column(DECIMAL(8, 3), nullable=True) # Changed to float for Mapped
+    volume_amount: Mapped[Optional[float]] = mapped_column(DECIMAL(8, 3, asdecimal=False), nullable=True) # Returned as float, no Decimal per row
     volume_unit: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     chemical_form: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     info: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -244,7 +249,7 @@ class MedicineATCCode(Base, TimestampMixin): # Added TimestampMixin
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     medicine_id: Mapped[int] = mapped_column(ForeignKey('medicines.id', ondelete='CASCADE'), nullable=False)
-    atc_code_id: Mapped[int] = mapped_column(ForeignKey('atc_codes.id', ondelete='CASCADE'), nullable=False)
+    atc_code_id: Mapped[int] = mapped_column(ForeignKey('atc_codes.id', ondelete='CASCADE'), nullable=False, index=True) # reverse lookups; the unique constraint leads with medicine_id
 
     medicine: Mapped["Medicine"] = relationship("Medicine", back_populates="medicine_atc_codes_association")
     atc_code: Mapped["ATCCode"] = relationship("ATCCode", back_populates="medicine_atc_codes_association")
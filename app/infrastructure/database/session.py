@@ -1,19 +1,61 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from typing import Generator
+import os
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from typing import AsyncGenerator
 from sqlalchemy_mptt import mptt_sessionmaker
 
 # Import the Base from your ORM models
 from app.infrastructure.database.models.ims.medicine import Base as IMSBase
 
 # Configuration
-DATABASE_URL = "sqlite:///./ims_database.db"  # SQLite for simplicity
+DATABASE_URL = "sqlite+aiosqlite:///./ims_database.db"  # SQLite for simplicity
 
-# Create the SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite with FastAPI
+
+def _engine_options(url: str) -> dict:
+    """
+    Connection pool settings. Connections are reused from a bounded pool instead of being
+    opened per request; pool_timeout makes a burst beyond pool_size + max_overflow fail
+    after 30s rather than wait forever. Pre-ping and recycling only matter for server
+    databases, whose connections can be dropped on the other end; a SQLite file
+    connection cannot go stale, so it skips the extra round trip on every checkout.
+    """
+    options = {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30}
+    if not url.startswith("sqlite"):
+        options.update(pool_pre_ping=True, pool_recycle=1800)
+    return options
+
+# Create the async SQLAlchemy engine (aiosqlite runs the connection in its own thread)
+engine = create_async_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+
+# Applied to every new SQLite connection. The page cache is per connection, so it is
+# sized with the pool's 15 connections in mind.
+_SQLITE_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-16384",  # 16 MiB
+)
+# WAL lets readers proceed while a write is in progress, and with synchronous=NORMAL a commit
+# no longer waits for an fsync (WAL stays consistent; only the last transactions can be lost on
+# power failure). The journal mode is stored in the database file itself, so it is opt-in:
+# set SQLITE_WAL=1 for a deployed database, and the checked-in ims_database.db is left as is.
+_SQLITE_WAL_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
 )
+if os.getenv("SQLITE_WAL", "0") == "1":
+    _SQLITE_PRAGMAS = _SQLITE_WAL_PRAGMAS + _SQLITE_PRAGMAS
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
 
 # # First create a standard sessionmaker
 # standard_sessionmaker = sessionmaker(
@@ -25,49 +67,57 @@ engine = create_engine(
 # # Then wrap it with mptt_sessionmaker
 # SessionLocal = mptt_sessionmaker(sessionmaker=standard_sessionmaker)
 
-# FROM CHATGPT WHEN I AM QUERING FOR CRUD CRM 03/09/2025 SEPTEMBER
-# TAKE A LOOK
-# from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-# from sqlalchemy.orm import sessionmaker, declarative_base
-# from app.core.config.base import settings
-
-
-# engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
-# AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-# Base = declarative_base()
+class MPTTSession(Session):
+    """Sync session class underneath every AsyncSession; MPTT's flush hooks are registered on it."""
 
 
-# async def get_db():
-# async with AsyncSessionLocal() as session:
-# yield session
-
-SessionLocal = mptt_sessionmaker(
-    sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# MPTT listens on sync Session events, so it is registered on the sync session class
+# that AsyncSession wraps.
+# expire_on_commit=False: expired attributes would otherwise be lazy-loaded on access,
+# which AsyncSession cannot do outside its greenlet.
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=mptt_sessionmaker(MPTTSession),
+    autoflush=False,
+    expire_on_commit=False
 )
 
 # Function to get a database session
-def get_db() -> Generator:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to provide a database session.
     This will be used in FastAPI path operations.
     """
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def drop_all_tables():
-    IMSBase.metadata.drop_all(bind=engine)
+async def drop_all_tables():
+    async with engine.begin() as connection:
+        await connection.run_sync(IMSBase.metadata.drop_all)
+
+def _create_missing_tables(connection) -> int:
+    """
+    Creates the metadata tables that do not exist yet. The existing table names are read in
+    a single inspector call, so an up-to-date schema costs one query and issues no DDL
+    (instead of create_all's per-table existence check). Returns the number of tables created.
+    """
+    existing = set(inspect(connection).get_table_names())
+    missing = [table for table in IMSBase.metadata.sorted_tables if table.name not in existing]
+    if missing:
+        IMSBase.metadata.create_all(connection, tables=missing)
+    return len(missing)
 
 # Function to create all tables defined in the Base metadata
-def create_all_tables():
+async def create_all_tables():
     """
-    Creates all database tables defined by the SQLAlchemy Base metadata.
+    Creates any database tables defined by the SQLAlchemy Base metadata that are missing.
     """
     print("Creating database tables...")
-    IMSBase.metadata.create_all(bind=engine)
-    print("Database tables created.")
+    async with engine.begin() as connection:
+        created = await connection.run_sync(_create_missing_tables)
+    print(f"Database tables created: {created}.")
 
 if __name__ == "__main__":
-    create_all_tables()
\ No newline at end of file
+    import asyncio
+    asyncio.run(create_all_tables())
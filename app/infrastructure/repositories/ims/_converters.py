@@ -0,0 +1,178 @@
+# app/infrastructure/repositories/ims/_converters.py
+
+"""
+ORM model -> domain entity converters used by MedicineSQLAlchemyRepository.
+Kept as plain module-level functions with no repository state so this module can be
+compiled on its own (e.g. Cython pure-Python mode) without touching the repository.
+"""
+
+from operator import attrgetter
+from typing import Any, Dict, List, Optional
+
+from app.domains.ims.medicine.entities.medicine import (
+    MedicineEntity,
+    CategoryEntity,
+    DoseFormEntity,
+    StrengthEntity,
+    ATCCodeEntity
+)
+from app.infrastructure.database.models.ims.medicine import (
+    Medicine,
+    Category,
+    DoseForm,
+    Strength,
+    ATCCode
+)
+
+# Scalar fields read with one C-level attrgetter call per row instead of one Python-level
+# attribute lookup per field. Each getter lists the fields in the entity's dataclass
+# field order so the result can be splatted positionally; keep them in sync.
+_MEDICINE_FIELDS = attrgetter(
+    "name", "slug", "id", "generic_name", "status", "description", "created_at", "updated_at"
+)
+_MEDICINE_SUMMARY_FIELDS = attrgetter("name", "slug", "id")
+_CATEGORY_FIELDS = attrgetter("name", "id", "parent_id", "slug", "description", "status", "level")
+_DOSE_FORM_FIELDS = attrgetter("name", "id", "description", "created_at", "updated_at")
+
+
+def to_medicine_entity(orm_medicine: Medicine) -> MedicineEntity:
+    if not orm_medicine:
+        return None
+    return to_medicine_entity_unchecked(orm_medicine)
+
+
+def to_medicine_entity_unchecked(orm_medicine: Medicine) -> MedicineEntity:
+    """Same as to_medicine_entity() without the None guard, for rows coming straight from a result."""
+    return MedicineEntity(
+        *_MEDICINE_FIELDS(orm_medicine),
+        categories=list(map(to_category_entity, orm_medicine.categories)),
+        strengths=list(map(to_strength_entity, orm_medicine.strengths)),
+        atc_codes=list(map(to_atc_code_entity, orm_medicine.atc_codes))
+    )
+
+
+def to_medicine_entity_from_row(
+    row: Any,
+    categories: List[CategoryEntity],
+    strengths: List[StrengthEntity],
+    atc_codes: List[ATCCodeEntity]
+) -> MedicineEntity:
+    """Builds a MedicineEntity from a medicine column row and already converted relations."""
+    return MedicineEntity(
+        *_MEDICINE_FIELDS(row),
+        categories=categories,
+        strengths=strengths,
+        atc_codes=atc_codes
+    )
+
+
+def to_medicine_summary_entity(orm_medicine: Medicine) -> MedicineEntity:
+    """Builds a MedicineEntity from a row loaded with only id, name, slug and status."""
+    return MedicineEntity(*_MEDICINE_SUMMARY_FIELDS(orm_medicine), status=orm_medicine.status)
+
+
+def convert_cached(cache: Dict[int, Any], convert, orm_objects) -> List[Any]:
+    """
+    Converts `orm_objects` (ORM objects or column rows with an `id`), reusing the entity
+    already in `cache` for a given id, so a category or ATC code shared by several
+    medicines is built once.
+    """
+    entities = []
+    for orm_object in orm_objects:
+        entity = cache.get(orm_object.id)
+        if entity is None:
+            entity = cache[orm_object.id] = convert(orm_object)
+        entities.append(entity)
+    return entities
+
+
+def to_category_entity(orm_category: Category) -> CategoryEntity:
+    if not orm_category:
+        return None
+
+    # Fields up to the MPTT level come positionally; children (populated when building the
+    # tree or explicitly loaded) sits between level and the timestamps in the dataclass
+    return CategoryEntity(
+        *_CATEGORY_FIELDS(orm_category),
+        children=[],
+        created_at=orm_category.created_at,
+        updated_at=orm_category.updated_at
+    )
+
+
+def assemble_category_tree(
+    rows,
+    roots: Optional[List[CategoryEntity]] = None,
+    stack: Optional[List[CategoryEntity]] = None
+) -> List[CategoryEntity]:
+    """
+    Converts category rows given in MPTT preorder (tree_id, left) into entities and wires
+    their children, returning the roots. One pass with a stack of open ancestors: pop until
+    the top is shallower than the current node, which makes it the parent. A node at the
+    starting level (a new tree, or the subtree root) empties the stack.
+    To feed rows in chunks, pass the same `roots` and `stack` lists on every call.
+    """
+    if roots is None:
+        roots = []
+    if stack is None:
+        stack = []
+    push, pop = stack.append, stack.pop
+    for row in rows:
+        entity = to_category_entity(row)
+        level = entity.level
+        while stack and stack[-1].level >= level:
+            pop()
+        if stack:
+            stack[-1].children.append(entity)
+        else:
+            roots.append(entity)
+        push(entity)
+    return roots
+
+
+def to_dose_form_entity(orm_dose_form: DoseForm) -> DoseFormEntity:
+    if not orm_dose_form:
+        return None
+    return DoseFormEntity(*_DOSE_FORM_FIELDS(orm_dose_form))
+
+
+def to_strength_entity(orm_strength: Strength) -> StrengthEntity:
+    if not orm_strength:
+        return None
+    return StrengthEntity(
+        id=orm_strength.id,
+        medicine_id=orm_strength.medicine_id,
+        dose_form_id=orm_strength.dose_form_id,
+        # The DECIMAL columns are mapped with asdecimal=False, so these are already floats
+        concentration_amount=orm_strength.concentration_amount,
+        concentration_unit=orm_strength.concentration_unit,
+        volume_amount=orm_strength.volume_amount,
+        volume_unit=orm_strength.volume_unit,
+        chemical_form=orm_strength.chemical_form,
+        info=orm_strength.info,
+        description=orm_strength.description,
+        created_at=orm_strength.created_at,
+        updated_at=orm_strength.updated_at,
+        deleted_at=orm_strength.deleted_at
+    )
+
+
+def to_atc_code_entity(orm_atc_code: ATCCode) -> ATCCodeEntity:
+    if not orm_atc_code:
+        return None
+    return ATCCodeEntity(
+        id=orm_atc_code.id,
+        parent_id=orm_atc_code.parent_id,
+        name=orm_atc_code.name,
+        code=orm_atc_code.code,
+        level=orm_atc_code.level,
+        slug=orm_atc_code.slug,
+        status=orm_atc_code.status,
+        description=orm_atc_code.description,
+        created_by=orm_atc_code.created_by,
+        updated_by=orm_atc_code.updated_by,
+        deleted_by=orm_atc_code.deleted_by,
+        created_at=orm_atc_code.created_at,
+        updated_at=orm_atc_code.updated_at,
+        deleted_at=orm_atc_code.deleted_at
+    )
@@ -10,7 +10,7 @@ class MedicineRepositoryImpl(MedicineRepository):
         self.db = db
     
     def create(self, medicine: MedicineCreate) -> Medicine:
-        db_medicine = MedicineModel(**medicine.dict(exclude={"category_ids"}))
+        db_medicine = MedicineModel(**medicine.model_dump(exclude={"category_ids"}, exclude_unset=True))
         self.db.add(db_medicine)
         self.db.commit()
         self.db.refresh(db_medicine)
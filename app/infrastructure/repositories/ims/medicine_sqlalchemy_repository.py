@@ -1,8 +1,12 @@
 # app/infrastructure/repositories/ims/medicine_sqlalchemy_repository.py
 
-from typing import List, Optional, Dict, Any # Added Dict, Any for raw data return
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, select # Import select for modern SQLAlchemy queries
+from itertools import islice
+from typing import List, Optional, Dict, Any, Iterable # Added Dict, Any for raw data return
+from sqlalchemy.orm import selectinload, raiseload, load_only, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, case, func, select, insert, update, delete, lambda_stmt # Import select for modern SQLAlchemy queries
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 
 from app.domains.ims.medicine.repositories.medicine_repository import IMedicineRepository
@@ -22,121 +26,211 @@ from app.infrastructure.database.models.ims.medicine import (
     MedicineCategory,
     MedicineATCCode
 )
+from app.infrastructure.database.cache import get_shared, set_shared, shared_generation, invalidate_shared
+from app.infrastructure.repositories.ims._converters import (
+    to_medicine_entity,
+    to_medicine_entity_unchecked,
+    to_medicine_entity_from_row,
+    to_medicine_summary_entity,
+    convert_cached,
+    to_category_entity,
+    to_dose_form_entity,
+    to_strength_entity,
+    to_atc_code_entity,
+    assemble_category_tree
+)
+
+# Eager-load every collection _to_medicine_entity touches: one batched IN query per relationship.
+# raiseload("*") makes any other lazy access fail loudly instead of silently adding N+1 queries.
+# Read paths only: mutating methods may legitimately touch further relationships.
+# Module-level so lambda_stmt() closures can reference it as a constant rather than via `self`.
+_MED_LOAD_OPTS = (
+    selectinload(Medicine.categories).raiseload("*"),
+    selectinload(Medicine.strengths).raiseload("*"),
+    selectinload(Medicine.atc_codes).raiseload("*"),
+    raiseload("*"),
+)
+
+# Scalar medicine columns for the list path; relations are fetched separately and stitched
+# in by medicine id, so no Medicine ORM objects are hydrated.
+_MEDICINE_COLS = (
+    Medicine.id, Medicine.name, Medicine.slug, Medicine.generic_name, Medicine.status,
+    Medicine.description, Medicine.created_at, Medicine.updated_at,
+)
+
+# Exactly the columns to_category_entity() reads. Selecting them returns plain Row tuples
+# (no ORM identity map, no MPTT left/right/tree_id), and Row exposes the same attribute
+# names, so the regular converter applies unchanged.
+_CATEGORY_COLS = (
+    Category.id, Category.parent_id, Category.name, Category.slug, Category.description,
+    Category.status, Category.created_at, Category.updated_at, Category.level,
+)
+
+# Direct-children count of the outer Category row as a correlated scalar subquery: evaluated
+# only for the rows actually selected (via the parent_id index) instead of grouping the
+# whole table by parent_id and joining the aggregate back.
+_ChildCategory = aliased(Category)
+_CHILDREN_COUNT = (
+    select(func.count(_ChildCategory.id))
+    .where(_ChildCategory.parent_id == Category.id)
+    .correlate(Category)
+    .scalar_subquery()
+    .label("children_count")
+)
+
+# Root of a subtree query, joined against the rows inside its left/right range
+_SubtreeRoot = aliased(Category)
 
-from rich.console import Console
+def _is_unique_violation(error: IntegrityError) -> bool:
+    """
+    True if `error` comes from a unique constraint, as opposed to a NOT NULL, foreign-key
+    or check failure. Postgres drivers expose SQLSTATE 23505; SQLite only has the message.
+    """
+    sqlstate = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+    if sqlstate is not None:
+        return sqlstate == "23505"
+    return "UNIQUE constraint failed" in str(error.orig)
 
-console = Console()
 
 class MedicineSQLAlchemyRepository(IMedicineRepository):
     """
-    Concrete implementation of IMedicineRepository using SQLAlchemy and MPTT for categories.
+    Concrete implementation of IMedicineRepository using SQLAlchemy (AsyncSession) and MPTT for categories.
     Translates between domain entities and SQLAlchemy ORM models.
+    Relationships must be loaded eagerly: lazy loads cannot run outside the session's greenlet.
     """
-    def __init__(self, db: Session):
-        self.db = db
 
-    # --- Helper functions for entity <-> ORM model conversion ---
-    def _to_medicine_entity(self, orm_medicine: Medicine) -> MedicineEntity:
-        if not orm_medicine:
-            return None
-        categories = [self._to_category_entity(cat) for cat in orm_medicine.categories]
-        strengths = [self._to_strength_entity(s) for s in orm_medicine.strengths]
-        atc_codes = [self._to_atc_code_entity(atc) for atc in orm_medicine.atc_codes]
-
-        return MedicineEntity(
-            id=orm_medicine.id,
-            name=orm_medicine.name,
-            slug=orm_medicine.slug,
-            generic_name=orm_medicine.generic_name,
-            status=orm_medicine.status,
-            description=orm_medicine.description,
-            created_at=orm_medicine.created_at,
-            updated_at=orm_medicine.updated_at,
-            categories=categories,
-            strengths=strengths,
-            atc_codes=atc_codes
-        )
-
-    def _to_category_entity(self, orm_category: Category) -> CategoryEntity:
-        if not orm_category:
-            # print("Warning: Received None in _to_category_entity") # Keep for debugging if needed
-            return None
-        
-        return CategoryEntity(
-            id=orm_category.id,
-            parent_id=orm_category.parent_id,
-            name=orm_category.name,
-            slug=orm_category.slug,
-            description=orm_category.description,
-            status=orm_category.status,
-            created_at=orm_category.created_at,
-            updated_at=orm_category.updated_at,
-            level=orm_category.level, # Include MPTT level
-            children=[] # Children will be populated when building the tree or explicitly loaded
-        )
+    def __init__(self, db: AsyncSession):
+        self.db = db
 
-    def _to_dose_form_entity(self, orm_dose_form: DoseForm) -> DoseFormEntity:
-        if not orm_dose_form:
-            return None
-        return DoseFormEntity(
-            id=orm_dose_form.id,
-            name=orm_dose_form.name,
-            description=orm_dose_form.description,
-            created_at=orm_dose_form.created_at,
-            updated_at=orm_dose_form.updated_at
-        )
+    async def _commit_unique(self, message: str) -> None:
+        """
+        Commits, translating a unique-constraint violation into a ValueError.
+        Lets the database enforce slug/code uniqueness instead of a SELECT before every write.
+        Other integrity errors (NOT NULL, foreign keys) are not the caller's fault to report
+        as a duplicate, so they are re-raised after rolling back.
+        """
+        try:
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if not _is_unique_violation(e):
+                raise
+            raise ValueError(message)
+
+    def _insert_ignore(self, model):
+        """Returns an INSERT for `model` that skips rows violating a unique constraint."""
+        insert = pg_insert if self.db.bind.dialect.name == "postgresql" else sqlite_insert
+        return insert(model).on_conflict_do_nothing()
+
+    @staticmethod
+    def _paginate(stmt, model, skip: int, limit: int, after_id: Optional[int]):
+        """
+        Orders `stmt` by id and pages it. With `after_id` it uses keyset pagination
+        (WHERE id > after_id), which reads only `limit` rows via the primary key at any
+        depth; otherwise it falls back to OFFSET/LIMIT, which scans and discards `skip` rows.
+        """
+        stmt = stmt.order_by(model.id).limit(limit)
+        if after_id is not None:
+            return stmt.where(model.id > after_id)
+        return stmt.offset(skip)
 
-    def _to_strength_entity(self, orm_strength: Strength) -> StrengthEntity:
-        if not orm_strength:
-            return None
-        return StrengthEntity(
-            id=orm_strength.id,
-            medicine_id=orm_strength.medicine_id,
-            dose_form_id=orm_strength.dose_form_id,
-            concentration_amount=float(orm_strength.concentration_amount),
-            concentration_unit=orm_strength.concentration_unit,
-            volume_amount=float(orm_strength.volume_amount) if orm_strength.volume_amount else None,
-            volume_unit=orm_strength.volume_unit,
-            chemical_form=orm_strength.chemical_form,
-            info=orm_strength.info,
-            description=orm_strength.description,
-            created_at=orm_strength.created_at,
-            updated_at=orm_strength.updated_at,
-            deleted_at=orm_strength.deleted_at
-        )
+    @staticmethod
+    def _normalize(value: Optional[str]) -> Optional[str]:
+        """
+        Category names/slugs are stored stripped and lowercased. Stripping first means
+        lower() only copies the trimmed text. Because stored values are already lowercase,
+        the plain unique index on slug serves lookups; no LOWER(slug) index is needed.
+        """
+        return value.strip().lower() if value else None
 
-    def _to_atc_code_entity(self, orm_atc_code: ATCCode) -> ATCCodeEntity:
-        if not orm_atc_code:
-            return None
-        return ATCCodeEntity(
-            id=orm_atc_code.id,
-            parent_id=orm_atc_code.parent_id,
-            name=orm_atc_code.name,
-            code=orm_atc_code.code,
-            level=orm_atc_code.level,
-            slug=orm_atc_code.slug,
-            status=orm_atc_code.status,
-            description=orm_atc_code.description,
-            created_by=orm_atc_code.created_by,
-            updated_by=orm_atc_code.updated_by,
-            deleted_by=orm_atc_code.deleted_by,
-            created_at=orm_atc_code.created_at,
-            updated_at=orm_atc_code.updated_at,
-            deleted_at=orm_atc_code.deleted_at
-        )
+    # --- Helper functions for entity <-> ORM model conversion ---
+    # Implemented as plain functions in _converters; bound as staticmethods so calls
+    # skip building a bound method and passing `self` on every row.
+    _to_medicine_entity = staticmethod(to_medicine_entity)
+    _to_medicine_entity_unchecked = staticmethod(to_medicine_entity_unchecked)
+    _to_medicine_summary_entity = staticmethod(to_medicine_summary_entity)
+    _to_category_entity = staticmethod(to_category_entity)
+    _to_dose_form_entity = staticmethod(to_dose_form_entity)
+    _to_strength_entity = staticmethod(to_strength_entity)
+    _to_atc_code_entity = staticmethod(to_atc_code_entity)
 
     # --- Medicine CRUD ---
     async def get_medicine_by_id(self, medicine_id: int) -> Optional[MedicineEntity]:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.id == medicine_id).first()
+        stmt = lambda_stmt(lambda: select(Medicine).options(*_MED_LOAD_OPTS).where(Medicine.id == medicine_id))
+        orm_medicine = (await self.db.execute(stmt)).scalars().first()
         return self._to_medicine_entity(orm_medicine)
 
     async def get_medicine_by_slug(self, slug: str) -> Optional[MedicineEntity]:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.slug == slug).first()
+        # lambda_stmt caches the constructed statement; `slug` is extracted as a bound parameter
+        stmt = lambda_stmt(lambda: select(Medicine).options(*_MED_LOAD_OPTS).where(Medicine.slug == slug))
+        orm_medicine = (await self.db.execute(stmt)).scalars().first()
         return self._to_medicine_entity(orm_medicine)
 
-    async def get_all_medicines(self, skip: int = 0, limit: int = 100) -> List[MedicineEntity]:
-        orm_medicines = self.db.query(Medicine).offset(skip).limit(limit).all()
-        return [self._to_medicine_entity(m) for m in orm_medicines]
+    async def get_all_medicines(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineEntity]:
+        # Same four statements as selectinload (page + one IN query per relation), but the
+        # medicines and categories come back as column rows rather than hydrated ORM objects.
+        # Like selectinload, the relation queries set no ORDER BY.
+        # The page is streamed in chunks of plain tuples; the relation queries need every id
+        # on it, so the rows are collected first and converted in one pass at the end.
+        result = await self.db.stream(
+            self._paginate(select(*_MEDICINE_COLS), Medicine, skip, limit, after_id)
+            .execution_options(yield_per=200)
+        )
+        rows = [row async for partition in result.partitions() for row in partition]
+        if not rows:
+            return []
+        medicine_ids = [row.id for row in rows]
+        categories: Dict[int, List[CategoryEntity]] = {medicine_id: [] for medicine_id in medicine_ids}
+        strengths: Dict[int, List[StrengthEntity]] = {medicine_id: [] for medicine_id in medicine_ids}
+        atc_codes: Dict[int, List[ATCCodeEntity]] = {medicine_id: [] for medicine_id in medicine_ids}
+
+        category_rows = (await self.db.execute(
+            select(MedicineCategory.medicine_id, *_CATEGORY_COLS)
+            .join(Category, Category.id == MedicineCategory.category_id)
+            .where(MedicineCategory.medicine_id.in_(medicine_ids))
+        )).all()
+        # Medicines on one page often share categories/ATC codes; build each entity once
+        cat_cache: Dict[int, CategoryEntity] = {}
+        for row, entity in zip(category_rows, convert_cached(cat_cache, self._to_category_entity, category_rows)):
+            categories[row.medicine_id].append(entity)
+
+        orm_strengths = (await self.db.execute(
+            select(Strength).options(raiseload("*"))
+            .where(Strength.medicine_id.in_(medicine_ids))
+        )).scalars()
+        for orm_strength in orm_strengths:
+            strengths[orm_strength.medicine_id].append(self._to_strength_entity(orm_strength))
+
+        atc_rows = (await self.db.execute(
+            select(MedicineATCCode.medicine_id, ATCCode).options(raiseload("*"))
+            .join(ATCCode, ATCCode.id == MedicineATCCode.atc_code_id)
+            .where(MedicineATCCode.medicine_id.in_(medicine_ids))
+        )).all()
+        atc_cache: Dict[int, ATCCodeEntity] = {}
+        atc_entities = convert_cached(atc_cache, self._to_atc_code_entity, [row.ATCCode for row in atc_rows])
+        for row, entity in zip(atc_rows, atc_entities):
+            atc_codes[row.medicine_id].append(entity)
+
+        return [
+            to_medicine_entity_from_row(row, categories[row.id], strengths[row.id], atc_codes[row.id])
+            for row in rows
+        ]
+
+    async def get_all_medicines_summary(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[MedicineEntity]:
+        """
+        List-view variant of get_all_medicines(): loads only id, name, slug and status
+        and no relationships. Use get_all_medicines() when descriptions or relations are needed.
+        """
+        stmt = (
+            self._paginate(
+                select(Medicine).options(load_only(Medicine.id, Medicine.name, Medicine.slug, Medicine.status), raiseload("*")),
+                Medicine, skip, limit, after_id
+            )
+            .execution_options(yield_per=200)
+        )
+        result = await self.db.stream(stmt)
+        to_entity = self._to_medicine_summary_entity
+        return [to_entity(m) async for m in result.scalars()]
 
     async def create_medicine(self, medicine_entity: MedicineEntity) -> MedicineEntity:
         orm_medicine = Medicine(
@@ -144,125 +238,241 @@ class MedicineSQLAlchemyRepository(IMedicineRepository):
             slug=medicine_entity.slug,
             generic_name=medicine_entity.generic_name,
             status=medicine_entity.status,
-            description=medicine_entity.description
+            description=medicine_entity.description,
+            # A new medicine has no relations yet; marking them loaded avoids lazy loads later
+            categories=[],
+            strengths=[],
+            atc_codes=[]
         )
         self.db.add(orm_medicine)
-        self.db.commit()
-        self.db.refresh(orm_medicine)
+        # id and the func.now() timestamps come back from the INSERT via RETURNING; no refresh needed
+        await self._commit_unique(f"Medicine with slug '{medicine_entity.slug}' already exists.")
         return self._to_medicine_entity(orm_medicine)
 
+    async def bulk_create_medicines(self, medicine_entities: Iterable[MedicineEntity], chunk_size: int = 500) -> int:
+        """
+        Inserts medicines in chunks of `chunk_size` as ORM bulk INSERTs (plain mappings, no
+        ORM objects or identity-map entries), all in one transaction: either every medicine
+        is created or, on a duplicate slug, none is and ValueError is raised.
+        Returns the number of medicines created.
+        """
+        created = 0
+        entities = iter(medicine_entities)
+        try:
+            while batch := list(islice(entities, chunk_size)):
+                await self.db.execute(insert(Medicine), [
+                    {
+                        "name": entity.name,
+                        "slug": entity.slug,
+                        "generic_name": entity.generic_name,
+                        "status": entity.status,
+                        "description": entity.description
+                    }
+                    for entity in batch
+                ])
+                created += len(batch)
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if not _is_unique_violation(e):
+                raise
+            raise ValueError("A medicine slug in the batch already exists; no medicines were created.")
+        return created
+
     async def update_medicine(self, medicine_id: int, medicine_entity: MedicineEntity) -> Optional[MedicineEntity]:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.id == medicine_id).first()
+        # Single UPDATE ... RETURNING instead of SELECT + attribute writes + refresh.
+        # updated_at is set by the column's onupdate (TimestampMixin) in the same statement.
+        stmt = (
+            update(Medicine)
+            .where(Medicine.id == medicine_id)
+            .values(
+                name=medicine_entity.name,
+                slug=medicine_entity.slug,
+                generic_name=medicine_entity.generic_name,
+                status=medicine_entity.status,
+                description=medicine_entity.description
+            )
+            .returning(Medicine)
+            .options(*_MED_LOAD_OPTS)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            orm_medicine = (await self.db.execute(stmt)).scalars().first()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if not _is_unique_violation(e):
+                raise
+            raise ValueError(f"Medicine with slug '{medicine_entity.slug}' already exists.")
         if not orm_medicine:
             return None
 
-        orm_medicine.name = medicine_entity.name
-        orm_medicine.slug = medicine_entity.slug
-        orm_medicine.generic_name = medicine_entity.generic_name
-        orm_medicine.status = medicine_entity.status
-        orm_medicine.description = medicine_entity.description
-        orm_medicine.updated_at = func.now() # Manually update timestamp if not handled by ORM default
-
-        self.db.add(orm_medicine)
-        self.db.commit()
-        self.db.refresh(orm_medicine)
-        return self._to_medicine_entity(orm_medicine)
+        await self.db.commit()
+        return self._to_medicine_entity_unchecked(orm_medicine)
 
     async def delete_medicine(self, medicine_id: int) -> bool:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.id == medicine_id).first()
+        orm_medicine = await self.db.get(Medicine, medicine_id)
         if not orm_medicine:
             return False
-        self.db.delete(orm_medicine)
-        self.db.commit()
+        await self.db.delete(orm_medicine)
+        await self.db.commit()
         return True
 
-    async def add_categories_to_medicine(self, medicine_id: int, category_ids: List[int]) -> None:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.id == medicine_id).first()
+    async def update_medicine_associations(
+        self,
+        medicine_id: int,
+        add_category_ids: Optional[List[int]] = None,
+        remove_category_ids: Optional[List[int]] = None,
+        add_atc_code_ids: Optional[List[int]] = None,
+        remove_atc_code_ids: Optional[List[int]] = None
+    ) -> None:
+        """
+        Applies every requested category / ATC code link change to a medicine and commits
+        them together: one transaction instead of one per kind of change. If any ID is
+        unknown, nothing is applied and ValueError is raised.
+        """
+        orm_medicine = await self.db.get(Medicine, medicine_id)
         if not orm_medicine:
             raise ValueError(f"Medicine with ID {medicine_id} not found.")
 
-        existing_category_ids = {cat.id for cat in orm_medicine.categories}
+        try:
+            if add_category_ids:
+                await self._link_categories(medicine_id, add_category_ids)
+            if remove_category_ids:
+                await self._unlink(MedicineCategory, MedicineCategory.category_id, medicine_id, remove_category_ids)
+            if add_atc_code_ids:
+                await self._link_atc_codes(medicine_id, add_atc_code_ids)
+            if remove_atc_code_ids:
+                await self._unlink(MedicineATCCode, MedicineATCCode.atc_code_id, medicine_id, remove_atc_code_ids)
+        except ValueError:
+            await self.db.rollback()
+            raise
+        await self.db.commit()
+        # Expire the (possibly loaded) collections so they are re-read on next access
+        if add_category_ids or remove_category_ids:
+            self.db.expire(orm_medicine, ["categories", "medicine_categories_association"])
+        if add_atc_code_ids or remove_atc_code_ids:
+            self.db.expire(orm_medicine, ["atc_codes", "medicine_atc_codes_association"])
+
+    async def _link_categories(self, medicine_id: int, category_ids: List[int]) -> None:
+        category_ids = list(dict.fromkeys(category_ids))
+        # One SELECT for all IDs as the existence check, then a single multi-row INSERT;
+        # ON CONFLICT DO NOTHING skips existing links
+        found_ids = set((await self.db.execute(
+            select(Category.id).where(Category.id.in_(category_ids))
+        )).scalars())
         for cat_id in category_ids:
-            if cat_id not in existing_category_ids:
-                orm_category = self.db.query(Category).filter(Category.id == cat_id).first()
-                if orm_category:
-                    orm_medicine.categories.append(orm_category)
-        self.db.commit()
-        self.db.refresh(orm_medicine)
+            if cat_id not in found_ids:
+                raise ValueError(f"Category with ID {cat_id} not found.")
 
-    async def remove_categories_from_medicine(self, medicine_id: int, category_ids: List[int]) -> None:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.id == medicine_id).first()
-        if not orm_medicine:
-            raise ValueError(f"Medicine with ID {medicine_id} not found.")
+        await self.db.execute(
+            self._insert_ignore(MedicineCategory).values(
+                [{"medicine_id": medicine_id, "category_id": cat_id} for cat_id in category_ids]
+            )
+        )
+
+    async def _link_atc_codes(self, medicine_id: int, atc_code_ids: List[int]) -> None:
+        # Only the new links matter: one SELECT on the pivot table finds the existing ones
+        # instead of loading the medicine's whole ATC code collection
+        atc_code_ids = list(dict.fromkeys(atc_code_ids))
+        linked_ids = set((await self.db.execute(
+            select(MedicineATCCode.atc_code_id).where(
+                MedicineATCCode.medicine_id == medicine_id,
+                MedicineATCCode.atc_code_id.in_(atc_code_ids)
+            )
+        )).scalars())
+        new_ids = [atc_id for atc_id in atc_code_ids if atc_id not in linked_ids]
+        if not new_ids:
+            return
+        # Same pattern as _link_categories(): one SELECT of IDs as the existence check,
+        # then a single multi-row INSERT into the pivot table
+        found_ids = set((await self.db.execute(
+            select(ATCCode.id).where(ATCCode.id.in_(new_ids))
+        )).scalars())
+        for atc_id in new_ids:
+            if atc_id not in found_ids:
+                raise ValueError(f"ATC Code with ID {atc_id} not found.")
+        await self.db.execute(
+            self._insert_ignore(MedicineATCCode).values(
+                [{"medicine_id": medicine_id, "atc_code_id": atc_id} for atc_id in new_ids]
+            )
+        )
+
+    async def _unlink(self, pivot, target_column, medicine_id: int, target_ids: List[int]) -> None:
+        # Single DELETE on the pivot table, no need to hydrate the related collection;
+        # the IDs are deduplicated so repeated ones do not bloat the IN list
+        await self.db.execute(
+            delete(pivot).where(pivot.medicine_id == medicine_id, target_column.in_(set(target_ids)))
+        )
+
+    async def add_categories_to_medicine(self, medicine_id: int, category_ids: List[int]) -> None:
+        await self.update_medicine_associations(medicine_id, add_category_ids=category_ids)
 
-        categories_to_remove = [cat for cat in orm_medicine.categories if cat.id in category_ids]
-        for cat in categories_to_remove:
-            orm_medicine.categories.remove(cat)
-        self.db.commit()
-        self.db.refresh(orm_medicine)
+    async def remove_categories_from_medicine(self, medicine_id: int, category_ids: List[int]) -> None:
+        await self.update_medicine_associations(medicine_id, remove_category_ids=category_ids)
 
     # --- Category CRUD (MPTT-aware) ---
     async def get_category_by_id(self, category_id: int) -> Optional[CategoryEntity]:
         """
         Retrieves a single category by its ID. Does not include children by default.
         """
-        orm_category = self.db.query(Category).filter(Category.id == category_id).first()
+        orm_category = await self.db.get(Category, category_id)
         return self._to_category_entity(orm_category)
 
     async def get_category_by_slug(self, slug: str) -> Optional[CategoryEntity]:
-        orm_category = self.db.query(Category).filter(Category.slug == slug).first()
+        stmt = lambda_stmt(lambda: select(Category).options(raiseload("*")).where(Category.slug == slug))
+        orm_category = (await self.db.execute(stmt)).scalars().first()
         return self._to_category_entity(orm_category)
 
-    async def get_all_categories(self, skip: int = 0, limit: int = 100) -> List[CategoryEntity]:
+    async def get_all_categories(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[CategoryEntity]:
         """Get all categories as a flat list with pagination."""
-        orm_categories = self.db.query(Category).offset(skip).limit(limit).all()
-        return [self._to_category_entity(c) for c in orm_categories]
+        stmt = self._paginate(
+            select(*_CATEGORY_COLS), Category, skip, limit, after_id
+        ).execution_options(yield_per=200)
+        result = await self.db.stream(stmt)
+        to_entity = self._to_category_entity
+        return [to_entity(row) async for row in result]
 
     async def get_category_tree(self) -> List[CategoryEntity]:
         """Returns complete category hierarchy as a list of root CategoryEntities with nested children."""
-        all_categories = self.db.query(Category).order_by(Category.tree_id, Category.left).all()
-        
-        category_map = {cat.id: self._to_category_entity(cat) for cat in all_categories}
-        root_categories = []
-        
-        for orm_cat in all_categories:
-            entity = category_map[orm_cat.id]
-            
-            if orm_cat.parent_id:
-                parent = category_map.get(orm_cat.parent_id)
-                if parent:
-                    parent.children.append(entity)
-            else:
-                root_categories.append(entity)
-        
-        return root_categories
+        # Reference data: served from the process-wide TTL cache, invalidated by category writes
+        cached = get_shared(("category_tree",))
+        if cached is not None:
+            return cached
+        generation = shared_generation("category_tree")
+
+        # Stream the rows in chunks (a server-side cursor where the driver supports one) and
+        # wire each chunk into the tree as it arrives, so the raw rows are never all held at once
+        stmt = (
+            select(*_CATEGORY_COLS)
+            .order_by(Category.tree_id, Category.left)
+            .execution_options(yield_per=1000)
+        )
+        result = await self.db.stream(stmt)
+        root_categories: List[CategoryEntity] = []
+        stack: List[CategoryEntity] = []
+        async for partition in result.partitions():
+            assemble_category_tree(partition, root_categories, stack)
+
+        return set_shared(("category_tree",), root_categories, generation)
 
     async def get_category_subtree(self, category_id: int) -> Optional[CategoryEntity]:
         """Get a category with all its descendants as a subtree."""
-        root_category = self.db.query(Category).filter(Category.id == category_id).first()
-        if not root_category:
+        # One statement: the root's left/right bounds come from a self-join instead of a
+        # separate lookup, and the rows inside that range (the root included) come back in order
+        descendants = (await self.db.execute(
+            select(*_CATEGORY_COLS)
+            .join(_SubtreeRoot, and_(
+                _SubtreeRoot.tree_id == Category.tree_id,
+                Category.left.between(_SubtreeRoot.left, _SubtreeRoot.right)
+            ))
+            .where(_SubtreeRoot.id == category_id)
+            .order_by(Category.left)
+        )).all()
+        if not descendants:
             return None
-            
-        # Get all descendants using MPTT properties, including the root itself
-        descendants = self.db.query(Category).filter(
-            Category.tree_id == root_category.tree_id,
-            Category.left >= root_category.left,
-            Category.right <= root_category.right
-        ).order_by(Category.left).all()
-            
-        category_map = {}
-        for cat in descendants:
-            category_map[cat.id] = self._to_category_entity(cat)
-                
-        for cat in descendants:
-            if cat.id == root_category.id:
-                continue # Skip the root itself when assigning children
-                
-            parent = category_map.get(cat.parent_id)
-            if parent:
-                parent.children.append(category_map[cat.id])
-                    
-        return category_map[root_category.id]
+
+        # The root has the lowest left value of its range, so it comes first and is the only root
+        return assemble_category_tree(descendants)[0]
 
     # --- NEW METHODS FOR LAZY LOADING ---
 
@@ -271,198 +481,236 @@ class MedicineSQLAlchemyRepository(IMedicineRepository):
         Retrieves top-level categories and the count of their direct children.
         Returns a list of dictionaries, not CategoryEntity, to include `children_count`.
         """
-        # Query for all categories and their direct children counts
-        # This is more efficient than fetching all and then processing in Python
-        subquery = (
-            self.db.query(
-                Category.parent_id,
-                func.count(Category.id).label("children_count")
-            )
-            .filter(Category.parent_id.isnot(None)) # Only consider children
-            .group_by(Category.parent_id)
-            .subquery()
-        )
-
-        query = self.db.query(
-            Category,
-            subquery.c.children_count
-        ).outerjoin(
-            subquery, Category.id == subquery.c.parent_id
-        ).filter(
+        # Cached with the tree: every category write invalidates the "category_tree" namespace
+        key = ("category_tree", "top_level")
+        cached = get_shared(key)
+        if cached is not None:
+            return cached
+        generation = shared_generation("category_tree")
+
+        stmt = select(*_CATEGORY_COLS, _CHILDREN_COUNT).where(
             Category.parent_id.is_(None) # Filter for top-level categories
         ).order_by(Category.name)
 
-        results = query.all()
-
-        formatted_results = []
-        for orm_category, children_count in results:
-            category_dict = {
-                "id": orm_category.id,
-                "name": orm_category.name,
-                "slug": orm_category.slug,
-                "description": orm_category.description,
-                "status": orm_category.status,
-                "parent_id": orm_category.parent_id,
-                "created_at": orm_category.created_at.isoformat() if orm_category.created_at else None,
-                "updated_at": orm_category.updated_at.isoformat() if orm_category.updated_at else None,
-                "level": orm_category.level,
-                "has_children": (children_count or 0) > 0, # Ensure children_count is not None
-                "children_count": (children_count or 0)
-            }
-            formatted_results.append(category_dict)
-        return formatted_results
+        results = (await self.db.execute(stmt)).all()
+        return set_shared(key, [self._category_dict_with_count(row) for row in results], generation)
 
     async def get_children_of_category_with_child_count(self, category_id: int) -> List[Dict[str, Any]]:
         """
         Retrieves direct children of a given category and the count of their direct children.
         Returns a list of dictionaries.
         """
-        # First, check if the parent category exists.
-        parent_exists = self.db.query(Category.id).filter(Category.id == category_id).first()
-        if not parent_exists:
-            return [] # Or raise an error if you prefer to indicate parent not found
-
-        # Optimized query to get direct children and their respective child counts
-        subquery = (
-            self.db.query(
-                Category.parent_id,
-                func.count(Category.id).label("children_count")
-            )
-            .filter(Category.parent_id.isnot(None))
-            .group_by(Category.parent_id)
-            .subquery()
-        )
+        # An unknown category_id simply matches no rows, so no separate existence probe
+        # is needed: the result is [] either way.
+        return (await self.get_children_of_categories_with_child_count([category_id]))[category_id]
 
-        query = self.db.query(
-            Category,
-            subquery.c.children_count
-        ).outerjoin(
-            subquery, Category.id == subquery.c.parent_id
-        ).filter(
-            Category.parent_id == category_id # Filter for direct children of the given category_id
+    async def get_children_of_categories_with_child_count(self, category_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Batched get_children_of_category_with_child_count(): the direct children of every
+        requested category in one `WHERE parent_id IN (...)` query, grouped by parent id.
+        Every requested id is a key of the result, with [] when it has no children.
+        """
+        children: Dict[int, List[Dict[str, Any]]] = {category_id: [] for category_id in category_ids}
+        if not children:
+            return children
+        stmt = select(*_CATEGORY_COLS, _CHILDREN_COUNT).where(
+            Category.parent_id.in_(children)
         ).order_by(Category.name)
 
-        results = query.all()
-
-        formatted_results = []
-        for orm_category, children_count in results:
-            category_dict = {
-                "id": orm_category.id,
-                "name": orm_category.name,
-                "slug": orm_category.slug,
-                "description": orm_category.description,
-                "status": orm_category.status,
-                "parent_id": orm_category.parent_id,
-                "created_at": orm_category.created_at.isoformat() if orm_category.created_at else None,
-                "updated_at": orm_category.updated_at.isoformat() if orm_category.updated_at else None,
-                "level": orm_category.level,
-                "has_children": (children_count or 0) > 0,
-                "children_count": (children_count or 0)
-            }
-            formatted_results.append(category_dict)
-        return formatted_results
+        for row in (await self.db.execute(stmt)).all():
+            children[row.parent_id].append(self._category_dict_with_count(row))
+        return children
+
+    @staticmethod
+    def _category_dict_with_count(row) -> Dict[str, Any]:
+        """Builds the lazy-loading category dict from a `_CATEGORY_COLS + children_count` row."""
+        return {
+            "id": row.id,
+            "name": row.name,
+            "slug": row.slug,
+            "description": row.description,
+            "status": row.status,
+            "parent_id": row.parent_id,
+            "created_at": row.created_at, # serialized to ISO 8601 by the response encoder
+            "updated_at": row.updated_at,
+            "level": row.level,
+            "has_children": row.children_count > 0,
+            "children_count": row.children_count
+        }
 
     # --- Category CRUD (continued) ---
     async def create_category(self, category_entity: CategoryEntity, parent_id: Optional[int] = None) -> CategoryEntity:
         orm_category = Category(
-            name=category_entity.name.lower().strip() if category_entity.name else None,
-            slug=category_entity.slug.lower().strip() if category_entity.slug else None,
+            name=self._normalize(category_entity.name),
+            slug=self._normalize(category_entity.slug),
             description=category_entity.description,
             status=category_entity.status,
         )
 
         if parent_id:
-            parent_orm = self.db.query(Category).filter(Category.id == parent_id).first()
+            parent_orm = await self.db.get(Category, parent_id)
             if not parent_orm:
                 raise ValueError(f"Parent category with ID {parent_id} not found.")
-            try:
-                # Use MPTT's append_child for proper tree maintenance
-                parent_orm.append_child(orm_category) 
-                self.db.commit()
-                self.db.refresh(orm_category) # Refresh to get MPTT fields (level, lft, rgt)
-            except IntegrityError as e:
-                self.db.rollback()
-                raise ValueError(f"Failed to append child category: {e}")
-        else:
-            self.db.add(orm_category)
-            self.db.commit()
-            self.db.refresh(orm_category)
+            # MPTT places the node under its parent on insert (sets tree_id, lft, rgt, level)
+            orm_category.parent_id = parent_id
+
+        self.db.add(orm_category)
+        # _commit_unique() turns a duplicate slug into ValueError after rolling back
+        await self._commit_unique(f"Category with slug '{orm_category.slug}' already exists.")
+        # id and timestamps come back via INSERT ... RETURNING, but MPTT expires the tree
+        # columns after flush; the entity only needs level, so reload just that column
+        await self.db.refresh(orm_category, ["level"])
 
+        invalidate_shared("category_tree")
         return self._to_category_entity(orm_category)
             
 
     async def update_category(self, category_id: int, category_entity: CategoryEntity) -> Optional[CategoryEntity]:
-        orm_category = self.db.query(Category).filter(Category.id == category_id).first()
+        # Single UPDATE ... RETURNING instead of get() + attribute writes + commit + refresh.
+        # Only plain columns change, so MPTT's flush hooks have nothing to do here; parent
+        # changes go through move_category(). updated_at is set by the column's onupdate.
+        slug = self._normalize(category_entity.slug)
+        stmt = (
+            update(Category)
+            .where(Category.id == category_id)
+            .values(
+                name=self._normalize(category_entity.name),
+                slug=slug,
+                description=category_entity.description,
+                status=category_entity.status
+            )
+            .returning(Category)
+            .options(raiseload("*"))
+            .execution_options(populate_existing=True)
+        )
+        try:
+            orm_category = (await self.db.execute(stmt)).scalars().first()
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            if not _is_unique_violation(e):
+                raise
+            raise ValueError(f"Category with slug '{slug}' already exists.")
         if not orm_category:
             return None
 
-        orm_category.name = category_entity.name.lower().strip() if category_entity.name else None
-        orm_category.slug = category_entity.slug.lower().strip() if category_entity.slug else None
-        orm_category.description = category_entity.description
-        orm_category.status = category_entity.status
-        orm_category.updated_at = func.now()
-
-        # Handle parent_id change if needed (requires MPTT's move_to method)
-        # if category_entity.parent_id is not None and orm_category.parent_id != category_entity.parent_id:
-        #     new_parent_orm = self.db.query(Category).filter(Category.id == category_entity.parent_id).first()
-        #     if new_parent_orm:
-        #         orm_category.move_to(new_parent_orm, position='last-child')
-        #     else:
-        #         raise ValueError(f"New parent category with ID {category_entity.parent_id} not found.")
-        # elif category_entity.parent_id is None and orm_category.parent_id is not None:
-        #     # Move to root
-        #     orm_category.move_to(None) # MPTT allows moving to None for root
-
-        self.db.add(orm_category)
-        self.db.commit()
-        self.db.refresh(orm_category)
+        invalidate_shared("category_tree")
         return self._to_category_entity(orm_category)
 
     async def delete_category(self, category_id: int) -> bool:
-        orm_category = self.db.query(Category).filter(Category.id == category_id).first()
+        orm_category = await self.db.get(Category, category_id)
         if not orm_category:
             raise ValueError(f"Category with ID {category_id} not found.")
         
         try:
             # MPTT's delete() method deletes the node and its descendants
-            self.db.delete(orm_category) # SQLAlchemy delete
-            self.db.commit() # Commit triggers MPTT's tree reconstruction
+            await self.db.delete(orm_category) # SQLAlchemy delete
+            await self.db.commit() # Commit triggers MPTT's tree reconstruction
+            invalidate_shared("category_tree")
             return True
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError(f"Error deleting category: {e}") 
 
     async def move_category(self, category_id: int, new_parent_id: Optional[int]) -> bool:
-        """Move category to new parent (None for root)"""
-        category = self.db.query(Category).filter(Category.id == category_id).first()
+        """Move category to new parent (None for root). Under a parent it becomes the last child."""
+        category = await self.db.get(Category, category_id)
         if not category:
             return False
             
         try:
             if new_parent_id:
-                new_parent = self.db.query(Category).filter(Category.id == new_parent_id).first()
+                new_parent = await self.db.get(Category, new_parent_id)
                 if not new_parent:
                     return False
-                # Use MPTT's move_to method
-                category.move_to(new_parent, position='last-child')
+                if new_parent.tree_id == category.tree_id and category.left <= new_parent.left <= category.right:
+                    raise ValueError("A category cannot be moved inside its own subtree.")
+                await self._append_subtree(category, new_parent)
             else:
-                # Move to root
-                category.move_to(None) 
-                    
-            self.db.commit()
+                # Clearing the parent turns the subtree into a tree of its own
+                category.parent_id = None
+
+            await self.db.commit()
+            invalidate_shared("category_tree")
             return True
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValueError(f"Error moving category: {e}") # Provide more specific error info
-    
+
+    async def _append_subtree(self, category: Category, new_parent: Category) -> None:
+        """
+        Moves `category` and its descendants to the end of `new_parent`'s children with
+        set-based nested-set UPDATEs. sqlalchemy_mptt has no move_to(): move_inside() places
+        the node first under the parent, and its move_after() computes wrong ranges.
+        Like update_category(), the statements bypass MPTT's flush hooks.
+        """
+        left, right, level, tree_id = category.left, category.right, category.level, category.tree_id
+        width = right - left + 1
+        # 1. Park the subtree at negative positions so the shifts below skip it
+        await self.db.execute(
+            update(Category)
+            .where(Category.tree_id == tree_id, Category.left.between(left, right))
+            .values(left=-Category.left, right=-Category.right)
+            .execution_options(synchronize_session=False)
+        )
+        # 2. Close the gap it leaves behind
+        await self.db.execute(
+            update(Category)
+            .where(Category.tree_id == tree_id, Category.right > right)
+            .values(
+                left=case((Category.left > right, Category.left - width), else_=Category.left),
+                right=Category.right - width
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # 3. Open a gap of the same width just before the parent's right edge
+        insert_at = (await self.db.execute(
+            select(Category.right).where(Category.id == new_parent.id)
+        )).scalar_one()
+        await self.db.execute(
+            update(Category)
+            .where(Category.tree_id == new_parent.tree_id, Category.right >= insert_at)
+            .values(
+                left=case((Category.left >= insert_at, Category.left + width), else_=Category.left),
+                right=Category.right + width
+            )
+            .execution_options(synchronize_session=False)
+        )
+        # 4. Drop the parked subtree into the gap
+        await self.db.execute(
+            update(Category)
+            .where(Category.tree_id == tree_id, Category.left < 0)
+            .values(
+                tree_id=new_parent.tree_id,
+                left=-Category.left - left + insert_at,
+                right=-Category.right - left + insert_at,
+                level=Category.level + (new_parent.level + 1 - level)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(
+            update(Category)
+            .where(Category.id == category.id)
+            .values(parent_id=new_parent.id)
+            .execution_options(synchronize_session=False)
+        )
+        # The loaded instances now hold stale tree columns
+        self.db.expire(category)
+        self.db.expire(new_parent)
+
     # --- DoseForm CRUD ---
     async def get_dose_form_by_id(self, dose_form_id: int) -> Optional[DoseFormEntity]:
-        orm_dose_form = self.db.query(DoseForm).filter(DoseForm.id == dose_form_id).first()
+        orm_dose_form = await self.db.get(DoseForm, dose_form_id)
         return self._to_dose_form_entity(orm_dose_form)
 
     async def get_all_dose_forms(self, skip: int = 0, limit: int = 100) -> List[DoseFormEntity]:
-        orm_dose_forms = self.db.query(DoseForm).offset(skip).limit(limit).all()
-        return [self._to_dose_form_entity(df) for df in orm_dose_forms]
+        key = ("dose_forms", skip, limit)
+        cached = get_shared(key)
+        if cached is not None:
+            return cached
+        generation = shared_generation("dose_forms")
+        orm_dose_forms = (await self.db.execute(select(DoseForm).offset(skip).limit(limit))).scalars().all()
+        return set_shared(key, list(map(self._to_dose_form_entity, orm_dose_forms)), generation)
 
     async def create_dose_form(self, dose_form_entity: DoseFormEntity) -> DoseFormEntity:
         orm_dose_form = DoseForm(
@@ -470,18 +718,19 @@ class MedicineSQLAlchemyRepository(IMedicineRepository):
             description=dose_form_entity.description
         )
         self.db.add(orm_dose_form)
-        self.db.commit()
-        self.db.refresh(orm_dose_form)
+        await self.db.commit() # id and timestamps are populated via INSERT ... RETURNING
+        invalidate_shared("dose_forms")
         return self._to_dose_form_entity(orm_dose_form)
 
     # --- Strength CRUD ---
     async def get_strength_by_id(self, strength_id: int) -> Optional[StrengthEntity]:
-        orm_strength = self.db.query(Strength).filter(Strength.id == strength_id).first()
+        orm_strength = await self.db.get(Strength, strength_id)
         return self._to_strength_entity(orm_strength)
 
     async def get_strengths_for_medicine(self, medicine_id: int) -> List[StrengthEntity]:
-        orm_strengths = self.db.query(Strength).filter(Strength.medicine_id == medicine_id).all()
-        return [self._to_strength_entity(s) for s in orm_strengths]
+        stmt = lambda_stmt(lambda: select(Strength).options(raiseload("*")).where(Strength.medicine_id == medicine_id))
+        orm_strengths = (await self.db.execute(stmt)).scalars().all()
+        return list(map(self._to_strength_entity, orm_strengths))
 
     async def create_strength(self, strength_entity: StrengthEntity) -> StrengthEntity:
         orm_strength = Strength(
@@ -496,33 +745,75 @@ class MedicineSQLAlchemyRepository(IMedicineRepository):
             description=strength_entity.description
         )
         self.db.add(orm_strength)
-        self.db.commit()
-        self.db.refresh(orm_strength)
+        await self.db.commit() # id and timestamps are populated via INSERT ... RETURNING
         return self._to_strength_entity(orm_strength)
 
+    async def bulk_create_strengths(self, strength_entities: Iterable[StrengthEntity], chunk_size: int = 500) -> int:
+        """
+        Inserts strengths in chunks of `chunk_size` as ORM bulk INSERTs (plain mappings, no
+        ORM objects, no refresh), all in one transaction: on a duplicate strength or an unknown
+        medicine/dose form nothing is created and ValueError is raised. Returns the number created.
+        Categories and ATC codes have no equivalent: MPTT computes their tree columns per row on insert.
+        """
+        created = 0
+        entities = iter(strength_entities)
+        try:
+            while batch := list(islice(entities, chunk_size)):
+                await self.db.execute(insert(Strength), [
+                    {
+                        "medicine_id": entity.medicine_id,
+                        "dose_form_id": entity.dose_form_id,
+                        "concentration_amount": entity.concentration_amount,
+                        "concentration_unit": entity.concentration_unit,
+                        "volume_amount": entity.volume_amount,
+                        "volume_unit": entity.volume_unit,
+                        "chemical_form": entity.chemical_form,
+                        "info": entity.info,
+                        "description": entity.description
+                    }
+                    for entity in batch
+                ])
+                created += len(batch)
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise ValueError(
+                "The strength batch violates a database constraint (duplicate strength or unknown "
+                "medicine/dose form); no strengths were created."
+            )
+        return created
+
     # --- ATC Code CRUD ---
     async def get_atc_code_by_id(self, atc_code_id: int) -> Optional[ATCCodeEntity]:
-        orm_atc_code = self.db.query(ATCCode).filter(ATCCode.id == atc_code_id).first()
+        orm_atc_code = await self.db.get(ATCCode, atc_code_id)
         return self._to_atc_code_entity(orm_atc_code)
 
     async def get_atc_code_by_code(self, code: str) -> Optional[ATCCodeEntity]:
-        orm_atc_code = self.db.query(ATCCode).filter(ATCCode.code == code).first()
+        stmt = lambda_stmt(lambda: select(ATCCode).options(raiseload("*")).where(ATCCode.code == code))
+        orm_atc_code = (await self.db.execute(stmt)).scalars().first()
         return self._to_atc_code_entity(orm_atc_code)
 
     async def get_atc_code_by_slug(self, slug: str) -> Optional[ATCCodeEntity]:
-        orm_atc_code = self.db.query(ATCCode).filter(ATCCode.slug == slug).first()
+        stmt = lambda_stmt(lambda: select(ATCCode).options(raiseload("*")).where(ATCCode.slug == slug))
+        orm_atc_code = (await self.db.execute(stmt)).scalars().first()
         return self._to_atc_code_entity(orm_atc_code)
 
-    async def get_all_atc_codes(self, skip: int = 0, limit: int = 100) -> List[ATCCodeEntity]:
-        orm_atc_codes = self.db.query(ATCCode).offset(skip).limit(limit).all()
-        return [self._to_atc_code_entity(atc) for atc in orm_atc_codes]
+    async def get_all_atc_codes(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[ATCCodeEntity]:
+        # Reference data: served from the process-wide TTL cache, invalidated by ATC code writes
+        key = ("atc_codes", skip, limit, after_id)
+        cached = get_shared(key)
+        if cached is not None:
+            return cached
+        generation = shared_generation("atc_codes")
+        stmt = self._paginate(select(ATCCode).options(raiseload("*")), ATCCode, skip, limit, after_id)
+        orm_atc_codes = (await self.db.execute(stmt)).scalars().all()
+        return set_shared(key, list(map(self._to_atc_code_entity, orm_atc_codes)), generation)
 
     async def create_atc_code(self, atc_code_entity: ATCCodeEntity) -> ATCCodeEntity:
         orm_atc_code = ATCCode(
             parent_id=atc_code_entity.parent_id,
             name=atc_code_entity.name,
             code=atc_code_entity.code,
-            level=atc_code_entity.level,
             slug=atc_code_entity.slug,
             status=atc_code_entity.status,
             description=atc_code_entity.description,
@@ -531,31 +822,14 @@ class MedicineSQLAlchemyRepository(IMedicineRepository):
             deleted_by=atc_code_entity.deleted_by
         )
         self.db.add(orm_atc_code)
-        self.db.commit()
-        self.db.refresh(orm_atc_code)
+        await self._commit_unique(f"ATC Code '{atc_code_entity.code}' or slug '{atc_code_entity.slug}' already exists.")
+        invalidate_shared("atc_codes")
+        # MPTT expires the tree columns after flush; reload only the level the entity needs
+        await self.db.refresh(orm_atc_code, ["level"])
         return self._to_atc_code_entity(orm_atc_code)
 
     async def add_atc_codes_to_medicine(self, medicine_id: int, atc_code_ids: List[int]) -> None:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.id == medicine_id).first()
-        if not orm_medicine:
-            raise ValueError(f"Medicine with ID {medicine_id} not found.")
-
-        existing_atc_code_ids = {atc.id for atc in orm_medicine.atc_codes}
-        for atc_id in atc_code_ids:
-            if atc_id not in existing_atc_code_ids:
-                orm_atc_code = self.db.query(ATCCode).filter(ATCCode.id == atc_id).first()
-                if orm_atc_code:
-                    orm_medicine.atc_codes.append(orm_atc_code)
-        self.db.commit()
-        self.db.refresh(orm_medicine)
+        await self.update_medicine_associations(medicine_id, add_atc_code_ids=atc_code_ids)
 
     async def remove_atc_codes_from_medicine(self, medicine_id: int, atc_code_ids: List[int]) -> None:
-        orm_medicine = self.db.query(Medicine).filter(Medicine.id == medicine_id).first()
-        if not orm_medicine:
-            raise ValueError(f"Medicine with ID {medicine_id} not found.")
-
-        atc_codes_to_remove = [atc for atc in orm_medicine.atc_codes if atc.id in atc_code_ids]
-        for atc in atc_codes_to_remove:
-            orm_medicine.atc_codes.remove(atc)
-        self.db.commit()
-        self.db.refresh(orm_medicine)
\ No newline at end of file
+        await self.update_medicine_associations(medicine_id, remove_atc_code_ids=atc_code_ids)
\ No newline at end of file
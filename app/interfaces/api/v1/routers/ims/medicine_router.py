@@ -1,14 +1,18 @@
 # app/interfaces/api/v1/routers/ims/medicine_router.py
 
-from fastapi import APIRouter, Depends, status, HTTPException
-from typing import List, Dict, Any
-from sqlalchemy.orm import Session
+import hashlib
+
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request, Response
+from typing import List, Dict, Any, Optional, Sequence
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import Pydantic schemas for request/response bodies
 from app.application.schemas.ims.medicine_schemas import (
     MedicineCreate,
     MedicineUpdate,
     MedicineResponse,
+    MedicineSummaryResponse,
     CategoryCreate,
     CategoryUpdate, # Added for update
     CategoryResponse,
@@ -34,17 +38,62 @@ router = APIRouter(
     tags=["IMS - Medicines"]
 )
 
+# List serializers, built once at import time. The use cases already return validated
+# response models, so the hot list endpoints dump them straight to JSON instead of
+# letting FastAPI re-validate every item against `response_model` on each request.
+_MEDICINE_LIST = TypeAdapter(List[MedicineResponse])
+_MEDICINE_SUMMARY_LIST = TypeAdapter(List[MedicineSummaryResponse])
+_CATEGORY_LIST = TypeAdapter(List[CategoryResponse])
+_DOSE_FORM_LIST = TypeAdapter(List[DoseFormResponse])
+_ATC_CODE_LIST = TypeAdapter(List[ATCCodeResponse])
+
+def _json_list(
+    adapter: TypeAdapter,
+    items: Sequence[Any],
+    limit: Optional[int] = None,
+    request: Optional[Request] = None
+) -> Response:
+    """
+    Serializes `items` with a prebuilt adapter into a JSON response.
+    For keyset-paginated lists pass the page `limit` (see _cursor_limit): a full page advertises
+    its last `id` in `X-Next-Cursor`, to be sent back as `after_id` for the next page.
+    For read-mostly reference data pass the `request`: the body gets a content-hash ETag,
+    and a client that already holds it (If-None-Match) receives an empty 304 instead.
+    """
+    body = adapter.dump_json(items)
+    headers = {}
+    if limit is not None and items and len(items) >= limit:
+        headers["X-Next-Cursor"] = str(items[-1].id)
+    if request is not None:
+        etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "no-cache"  # may be stored, but revalidated before reuse
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in {tag.strip() for tag in if_none_match.split(",")}):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _cursor_limit(skip: int, limit: int, after_id: Optional[int]) -> Optional[int]:
+    """
+    The `limit` to hand to _json_list, or None when the request pages by `skip`.
+    A cursor continues a keyset walk: it is only offered when the request is one (`after_id`
+    given) or starts one (`skip == 0`), since following it from an offset page would mix
+    the two schemes and leave the client unsure which one the next page used.
+    """
+    return limit if after_id is not None or skip == 0 else None
+
 # Dependency to get MedicineUseCases instance
 # This function sets up the dependency chain:
 # get_db -> MedicineSQLAlchemyRepository -> MedicineService -> MedicineUseCases
-def get_medicine_use_cases(db: Session = Depends(get_db)) -> MedicineUseCases:
+# Declared `async def` on purpose: FastAPI runs plain `def` dependencies in its
+# threadpool, which would cost a thread hand-off on every request for three
+# trivial constructors.
+async def get_medicine_use_cases(db: AsyncSession = Depends(get_db)) -> MedicineUseCases:
     """
     Provides a MedicineUseCases instance with a SQLAlchemy repository.
     This function acts as a FastAPI dependency injector.
     """
-    repository = MedicineSQLAlchemyRepository(db)
-    service = MedicineService(repository)
-    return MedicineUseCases(service)
+    return MedicineUseCases(MedicineService(MedicineSQLAlchemyRepository(db)))
 
 # --- Medicine Endpoints ---
 @router.post("/", response_model=MedicineResponse, status_code=status.HTTP_201_CREATED)
@@ -58,16 +107,32 @@ async def create_medicine(
     """
     return await use_cases.create_medicine(medicine_create)
 
-@router.get("/", response_model=List[MedicineResponse])
+@router.get("/", response_model=None, responses={200: {"model": List[MedicineResponse]}})
 async def list_medicines(
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = None,
     use_cases: MedicineUseCases = Depends(get_medicine_use_cases)
 ):
     """
     Retrieve a list of all medicines with pagination.
+    Pass the last `id` of a page as `after_id` to fetch the next one (keyset pagination, ignores `skip`).
     """
-    return await use_cases.list_medicines(skip, limit)
+    return _json_list(_MEDICINE_LIST, await use_cases.list_medicines(skip, limit, after_id), _cursor_limit(skip, limit, after_id))
+
+# Declared before /{medicine_id} so "summary" is not parsed as an ID
+@router.get("/summary", response_model=None, responses={200: {"model": List[MedicineSummaryResponse]}})
+async def list_medicines_summary(
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    use_cases: MedicineUseCases = Depends(get_medicine_use_cases)
+):
+    """
+    Retrieve a lightweight list of medicines (id, name, slug, status) with pagination.
+    Pass the last `id` of a page as `after_id` to fetch the next one (keyset pagination, ignores `skip`).
+    """
+    return _json_list(_MEDICINE_SUMMARY_LIST, await use_cases.list_medicines_summary(skip, limit, after_id), _cursor_limit(skip, limit, after_id))
 
 @router.get("/{medicine_id}", response_model=MedicineResponse)
 async def get_medicine_by_id(
@@ -105,14 +170,15 @@ async def delete_medicine(
 
 # --- Category Endpoints ---
 # NEW ENDPOINT: Get top-level categories with child counts
-@router.get("/categories/tree", response_model=List[CategoryResponse], tags=["IMS - Categories"])
+@router.get("/categories/tree", response_model=None, responses={200: {"model": List[CategoryResponse]}}, tags=["IMS - Categories"])
 async def get_category_tree(
+    request: Request,
     use_cases: MedicineUseCases = Depends(get_medicine_use_cases)
 ):
     """
     Retrieve all categories in a hierarchical tree structure.
     """
-    return await use_cases.get_category_tree()
+    return _json_list(_CATEGORY_LIST, await use_cases.get_category_tree(), request=request)
 
 @router.get("/categories/top-level", response_model=List[Dict[str, Any]], tags=["IMS - Categories"])
 async def get_top_level_categories_with_child_count(
@@ -125,6 +191,21 @@ async def get_top_level_categories_with_child_count(
     return await use_cases.get_top_level_categories_with_child_count()
 
 
+# Batched variant of the endpoint below; declared before the /categories/{category_id} routes
+@router.get("/categories/direct-children/", response_model=Dict[int, List[Dict[str, Any]]], tags=["IMS - Categories"])
+async def get_direct_children_of_categories(
+    # Bounded: the IDs end up as bound parameters of a single `parent_id IN (...)`
+    category_ids: List[int] = Query(..., max_length=100),
+    use_cases: MedicineUseCases = Depends(get_medicine_use_cases)
+):
+    """
+    Retrieve the direct children of several categories in one request, keyed by category ID.
+    Use this when several tree nodes are expanded at once: one query instead of one request per node.
+    At most 100 IDs per request; repeated IDs are ignored.
+    """
+    return await use_cases.get_children_of_categories_with_child_count(list(dict.fromkeys(category_ids)))
+
+
 # NEW ENDPOINT: Get direct children of a specific category with child counts
 @router.get("/categories/{category_id}/direct-children/", response_model=List[Dict[str, Any]], tags=["IMS - Categories"])
 async def get_direct_children_of_category(
@@ -239,16 +320,18 @@ async def create_category(
     """
     return await use_cases.create_category(category_create)
 
-@router.get("/categories/", response_model=List[CategoryResponse], tags=["IMS - Categories"])
+@router.get("/categories/", response_model=None, responses={200: {"model": List[CategoryResponse]}}, tags=["IMS - Categories"])
 async def list_categories(
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = None,
     use_cases: MedicineUseCases = Depends(get_medicine_use_cases)
 ):
     """
     Retrieve a list of all categories with pagination (flat list).
+    Pass the last `id` of a page as `after_id` to fetch the next one (keyset pagination, ignores `skip`).
     """
-    return await use_cases.list_categories(skip, limit)
+    return _json_list(_CATEGORY_LIST, await use_cases.list_categories(skip, limit, after_id), _cursor_limit(skip, limit, after_id))
 
 # --- DoseForm Endpoints ---
 @router.post("/dose-forms/", response_model=DoseFormResponse, status_code=status.HTTP_201_CREATED, tags=["IMS - Dose Forms"])
@@ -261,8 +344,9 @@ async def create_dose_form(
     """
     return await use_cases.create_dose_form(dose_form_create)
 
-@router.get("/dose-forms/", response_model=List[DoseFormResponse], tags=["IMS - Dose Forms"])
+@router.get("/dose-forms/", response_model=None, responses={200: {"model": List[DoseFormResponse]}}, tags=["IMS - Dose Forms"])
 async def list_dose_forms(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     use_cases: MedicineUseCases = Depends(get_medicine_use_cases)
@@ -270,7 +354,7 @@ async def list_dose_forms(
     """
     Retrieve a list of all dose forms with pagination.
     """
-    return await use_cases.list_dose_forms(skip, limit)
+    return _json_list(_DOSE_FORM_LIST, await use_cases.list_dose_forms(skip, limit), request=request)
 
 # --- Strength Endpoints ---
 @router.post("/strengths/", response_model=StrengthResponse, status_code=status.HTTP_201_CREATED, tags=["IMS - Strengths"])
@@ -304,13 +388,16 @@ async def create_atc_code(
     """
     return await use_cases.create_atc_code(atc_code_create)
 
-@router.get("/atc-codes/", response_model=List[ATCCodeResponse], tags=["IMS - ATC Codes"])
+@router.get("/atc-codes/", response_model=None, responses={200: {"model": List[ATCCodeResponse]}}, tags=["IMS - ATC Codes"])
 async def list_atc_codes(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = None,
     use_cases: MedicineUseCases = Depends(get_medicine_use_cases)
 ):
     """
     Retrieve a list of all ATC codes with pagination.
+    Pass the last `id` of a page as `after_id` to fetch the next one (keyset pagination, ignores `skip`).
     """
-    return await use_cases.list_atc_codes(skip, limit)
+    return _json_list(_ATC_CODE_LIST, await use_cases.list_atc_codes(skip, limit, after_id), _cursor_limit(skip, limit, after_id), request)
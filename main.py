@@ -1,16 +1,22 @@
 # main.py
 
+import os
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from app.infrastructure.database.session import create_all_tables
 from app.interfaces.api.v1.routers.ims.medicine_router import router as medicine_router
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Application startup: Initializing database...")
-    create_all_tables()
-    print("Database initialization complete.")
+    # Set DB_AUTO_CREATE=0 where the schema is managed by migrations to skip the startup check
+    if os.getenv("DB_AUTO_CREATE", "1") == "1":
+        print("Application startup: Initializing database...")
+        await create_all_tables()
+        print("Database initialization complete.")
     yield
     # Optionally, add shutdown logic here
 
@@ -22,7 +28,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson encodes the dict-heavy list/tree payloads several times faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 origins = [
@@ -38,14 +46,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor of the list endpoints
 )
 
+# Compress larger payloads (category tree, medicine lists); small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers for different domains/features
 app.include_router(medicine_router)
 # You would include other routers here for HRM, Warehouse, etc.
 # app.include_router(hrm_router)
 # app.include_router(warehouse_router)
 
+def _check_unique_routes(app: FastAPI) -> None:
+    """
+    Fails at import time if a (method, path) pair is registered twice, e.g. a router
+    included twice. Starlette matches routes linearly, so a duplicate both shadows the
+    later handler and lengthens the match loop for every request.
+    """
+    seen = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or {None}:
+            key = (method, route.path)
+            if key in seen:
+                raise RuntimeError(f"Route {method} {route.path} is registered more than once.")
+            seen.add(key)
+
+_check_unique_routes(app)
+
 # Event handler for application startup
 # @app.on_event("startup")
 # async def startup_event():
@@ -69,7 +97,7 @@ async def read_root():
 # To run this application:
 # 1. Ensure you have all the files created as per the structure.
 # 2. Install necessary packages:
-#    pip install fastapi uvicorn sqlalchemy pydantic python-dotenv
+#    pip install fastapi uvicorn sqlalchemy pydantic python-dotenv orjson
 # 3. Run from your terminal in the parent directory of 'app':
 #    uvicorn main:app --reload
 # 4. Open your browser to `http://127.0.0.1:8000/docs` to see the interactive API documentation.
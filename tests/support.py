@@ -0,0 +1,46 @@
+# tests/support.py
+
+import unittest
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlalchemy_mptt import mptt_sessionmaker
+
+from app.infrastructure.database.models.ims.medicine import Base
+from app.infrastructure.database.session import MPTTSession
+from app.infrastructure.database.cache import invalidate_shared
+
+
+class RepositoryTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Runs each test against a fresh in-memory SQLite database, with a session factory
+    configured like SessionLocal. `self.statements` counts the SQL statements sent
+    to the database since the last reset_statements().
+    """
+
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        self.Session = async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            sync_session_class=mptt_sessionmaker(MPTTSession),
+            autoflush=False,
+            expire_on_commit=False
+        )
+        self.statements = 0
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._count_statement)
+        # The reference-data cache is process-wide; start every test cold
+        for namespace in ("category_tree", "dose_forms", "atc_codes"):
+            invalidate_shared(namespace)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    def _count_statement(self, *args):
+        self.statements += 1
+
+    def reset_statements(self):
+        self.statements = 0
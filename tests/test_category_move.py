@@ -0,0 +1,117 @@
+# tests/test_category_move.py
+
+from sqlalchemy import select
+
+from app.domains.ims.medicine.entities.medicine import CategoryEntity
+from app.infrastructure.database.models.ims.medicine import Category
+from app.infrastructure.repositories.ims.medicine_sqlalchemy_repository import MedicineSQLAlchemyRepository
+from tests.support import RepositoryTestCase
+
+
+class MoveCategoryTest(RepositoryTestCase):
+
+    async def _create(self, name, parent=None):
+        async with self.Session() as db:
+            created = await MedicineSQLAlchemyRepository(db).create_category(
+                CategoryEntity(name=name, slug=name), parent
+            )
+        return created.id
+
+    async def _move(self, category_id, new_parent_id):
+        async with self.Session() as db:
+            return await MedicineSQLAlchemyRepository(db).move_category(category_id, new_parent_id)
+
+    async def _tree(self, root_id):
+        """(name, parent name, lft, rgt, level) of every node of root_id's tree, in lft order."""
+        async with self.Session() as db:
+            rows = (await db.execute(
+                select(Category.id, Category.name, Category.parent_id, Category.left, Category.right, Category.level)
+                .where(Category.tree_id == select(Category.tree_id).where(Category.id == root_id).scalar_subquery())
+                .order_by(Category.left)
+            )).all()
+        names = {row.id: row.name for row in rows}
+        return [(row.name, names.get(row.parent_id), row.left, row.right, row.level) for row in rows]
+
+    async def test_move_places_node_after_existing_children(self):
+        a = await self._create("a")
+        b = await self._create("b", a)
+        await self._create("c", b)
+        d = await self._create("d", a)
+        await self._create("e", d)
+
+        self.assertTrue(await self._move(b, d))
+
+        self.assertEqual(await self._tree(a), [
+            ("a", None, 1, 10, 1),
+            ("d", "a", 2, 9, 2),
+            ("e", "d", 3, 4, 3),
+            ("b", "d", 5, 8, 3),
+            ("c", "b", 6, 7, 4),
+        ])
+
+    async def test_move_into_childless_parent(self):
+        a = await self._create("a")
+        b = await self._create("b", a)
+        d = await self._create("d", a)
+
+        self.assertTrue(await self._move(b, d))
+
+        self.assertEqual(await self._tree(a), [
+            ("a", None, 1, 6, 1),
+            ("d", "a", 2, 5, 2),
+            ("b", "d", 3, 4, 3),
+        ])
+
+    async def test_move_to_root_and_unknown_ids(self):
+        a = await self._create("a")
+        b = await self._create("b", a)
+
+        self.assertFalse(await self._move(b, 999))
+        self.assertFalse(await self._move(999, a))
+        self.assertTrue(await self._move(b, None))
+        self.assertEqual(await self._tree(b), [("b", None, 1, 2, 1)])
+        self.assertEqual(await self._tree(a), [("a", None, 1, 2, 1)])
+
+    async def test_move_within_same_parent_appends(self):
+        a = await self._create("a")
+        b = await self._create("b", a)
+        await self._create("c", b)
+        await self._create("d", a)
+
+        self.assertTrue(await self._move(b, a))
+
+        self.assertEqual(await self._tree(a), [
+            ("a", None, 1, 8, 1),
+            ("d", "a", 2, 3, 2),
+            ("b", "a", 4, 7, 2),
+            ("c", "b", 5, 6, 3),
+        ])
+
+    async def test_move_root_tree_under_another_tree(self):
+        a = await self._create("a")
+        await self._create("b", a)
+        x = await self._create("x")
+        await self._create("y", x)
+
+        self.assertTrue(await self._move(x, a))
+
+        self.assertEqual(await self._tree(a), [
+            ("a", None, 1, 8, 1),
+            ("b", "a", 2, 3, 2),
+            ("x", "a", 4, 7, 2),
+            ("y", "x", 5, 6, 3),
+        ])
+
+    async def test_move_inside_own_subtree_is_rejected(self):
+        a = await self._create("a")
+        b = await self._create("b", a)
+        c = await self._create("c", b)
+
+        for target in (b, c):
+            with self.assertRaises(ValueError):
+                await self._move(b, target)
+        self.assertEqual(await self._tree(a), [
+            ("a", None, 1, 6, 1),
+            ("b", "a", 2, 5, 2),
+            ("c", "b", 3, 4, 3),
+        ])
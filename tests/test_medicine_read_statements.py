@@ -0,0 +1,60 @@
+# tests/test_medicine_read_statements.py
+
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.infrastructure.database.models.ims.medicine import Category, Medicine
+from app.infrastructure.repositories.ims.medicine_sqlalchemy_repository import (
+    MedicineSQLAlchemyRepository,
+    _MED_LOAD_OPTS,
+)
+from tests.support import RepositoryTestCase
+
+# One statement for the medicines plus one per eagerly loaded relationship
+# (categories, strengths, ATC codes), whatever the number of medicines.
+EXPECTED_STATEMENTS = 1 + 3
+
+
+class MedicineReadStatementsTest(RepositoryTestCase):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        async with self.Session() as db:
+            categories = [Category(name=f"category {i}", slug=f"category-{i}") for i in range(3)]
+            db.add_all(categories)
+            await db.commit()
+            for i in range(20):
+                db.add(Medicine(
+                    name=f"medicine {i}", slug=f"medicine-{i}",
+                    categories=categories[: i % 3 + 1], strengths=[], atc_codes=[]
+                ))
+            await db.commit()
+
+    async def test_get_medicine_by_id_statement_count(self):
+        async with self.Session() as db:
+            self.reset_statements()
+            medicine = await MedicineSQLAlchemyRepository(db).get_medicine_by_id(3)
+        self.assertEqual(len(medicine.categories), 3)
+        self.assertEqual(self.statements, EXPECTED_STATEMENTS)
+
+    async def test_get_all_medicines_statement_count_does_not_grow_with_page(self):
+        for limit in (1, 20):
+            async with self.Session() as db:
+                self.reset_statements()
+                medicines = await MedicineSQLAlchemyRepository(db).get_all_medicines(0, limit)
+            self.assertEqual(len(medicines), limit)
+            self.assertEqual(self.statements, EXPECTED_STATEMENTS)
+
+    async def test_unloaded_relationship_access_raises(self):
+        async with self.Session() as db:
+            medicine = (await db.execute(
+                select(Medicine).options(*_MED_LOAD_OPTS).where(Medicine.id == 1)
+            )).scalars().one()
+            self.reset_statements()
+            # Matched on the message: a plain lazy load would also fail under AsyncSession
+            # (MissingGreenlet), but only after trying to emit SQL
+            with self.assertRaisesRegex(InvalidRequestError, "lazy='raise'"):
+                medicine.medicine_categories_association
+            with self.assertRaisesRegex(InvalidRequestError, "lazy='raise'"):
+                medicine.categories[0].medicines
+        self.assertEqual(self.statements, 0)